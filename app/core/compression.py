@@ -0,0 +1,255 @@
+import gzip
+import hashlib
+import zlib
+from typing import Callable, Dict, List, NamedTuple, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from ..services.memory_cache import MemoryCache
+
+# brotli and zstandard are optional; without them only gzip is offered
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# compressed bodies by coding and ETag or digest of the uncompressed bytes, per worker
+compressed_cache = MemoryCache(
+    max_bytes=settings.compression_cache_max_bytes,
+    max_entries=settings.compression_cache_max_entries
+)
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml"
+}
+
+class Encoder(NamedTuple):
+    name: str
+    compress: Callable[[bytes], bytes]
+    # a fresh incremental compressor for a streamed body
+    stream: Callable[[], "_Stream"]
+
+class _Stream(NamedTuple):
+    chunk: Callable[[bytes], bytes]
+    finish: Callable[[], bytes]
+
+def _gzip_stream() -> _Stream:
+    compressor = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return _Stream(
+        lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush
+    )
+
+def _brotli_stream() -> _Stream:
+    compressor = brotli.Compressor(quality=settings.compression_brotli_quality)
+    return _Stream(lambda data: compressor.process(data) + compressor.flush(), compressor.finish)
+
+def _zstd_stream() -> _Stream:
+    compressor = zstandard.ZstdCompressor(level=settings.compression_zstd_level).compressobj()
+    return _Stream(
+        lambda data: compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush
+    )
+
+def available_encoders() -> Dict[str, Encoder]:
+    """Installed encoders in server preference order (best ratio first)"""
+    encoders = {}
+    if brotli is not None:
+        encoders["br"] = Encoder(
+            "br",
+            lambda body: brotli.compress(body, quality=settings.compression_brotli_quality),
+            _brotli_stream
+        )
+    if zstandard is not None:
+        encoders["zstd"] = Encoder(
+            "zstd",
+            lambda body: zstandard.ZstdCompressor(level=settings.compression_zstd_level).compress(body),
+            _zstd_stream
+        )
+    # mtime=0 so the same body always compresses to the same bytes
+    encoders["gzip"] = Encoder(
+        "gzip",
+        lambda body: gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0),
+        _gzip_stream
+    )
+    return encoders
+
+def negotiate(accept_encoding: str, offered: List[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header. The highest
+    q-value wins, ties go to the server's order; q=0 refuses a coding and
+    "*" covers codings not listed.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in offered:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+def compression_stats() -> dict:
+    return {"encodings": list(available_encoders()), "cache": compressed_cache.stats()}
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that compresses text/JSON responses with the best
+    coding the client accepts (br, zstd, gzip). Bodies under minimum_size
+    are sent as-is. Compressed bodies are kept in a small in-process LRU
+    keyed by the response's strong ETag or a digest of the uncompressed
+    bytes, so a hot payload (e.g. a rendered response served from the
+    response cache) is compressed once per worker rather than once per
+    request. Streamed bodies are compressed chunk by chunk and flushed so
+    clients still receive them incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = settings.compression_min_bytes if minimum_size is None else minimum_size
+        self.encoders = available_encoders()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), list(self.encoders))
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compressed(self, encoding: str, body: bytes, etag: Optional[str] = None) -> bytes:
+        """Compressed body, from the cache when this exact payload was compressed before"""
+        if etag and not etag.startswith("W/"):
+            # a strong ETag already names these exact bytes, so skip hashing them
+            cache_key = f"{encoding}:etag:{etag}:{len(body)}"
+        else:
+            cache_key = f"{encoding}:{hashlib.sha256(body).hexdigest()}"
+        cached = compressed_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        data = self.encoders[encoding].compress(body)
+        compressed_cache.set(cache_key, data, settings.compression_cache_ttl_seconds, size=len(data))
+        return data
+
+class _CompressionResponder:
+    """Holds back the response start until the first body chunk shows whether to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.downstream = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_Stream] = None
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not compressible(headers.get("content-type", ""))
+            )
+            if message["status"] == 304 and self.encoding is not None:
+                # the 200 this revalidates was sent encoded, with a weakened ETag; match it
+                not_modified = MutableHeaders(scope=message)
+                not_modified.add_vary_header("Accept-Encoding")
+                _weaken_etag(not_modified)
+            return
+
+        if message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is not None:
+            data = self.stream.chunk(body)
+            if not more_body:
+                data += self.stream.finish()
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        if not more_body:
+            # the whole body in one message
+            if len(body) < self.middleware.minimum_size:
+                await self._flush_start()
+                await self.downstream(message)
+                return
+
+            headers = MutableHeaders(scope=self.start)
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is not None:
+                body = self.middleware.compressed(self.encoding, body, headers.get("etag"))
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(body))
+            await self._flush_start()
+            await self.downstream({"type": "http.response.body", "body": body})
+            return
+
+        # streamed body: the final size isn't known, so compress every chunk
+        headers = MutableHeaders(scope=self.start)
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None:
+            self.passthrough = True
+            await self._flush_start()
+            await self.downstream(message)
+            return
+
+        self.stream = self.middleware.encoders[self.encoding].stream()
+        self._mark_encoded(headers)
+        del headers["Content-Length"]
+        await self._flush_start()
+        await self.downstream({"type": "http.response.body", "body": self.stream.chunk(body), "more_body": True})
+
+    def _mark_encoded(self, headers: MutableHeaders):
+        headers["Content-Encoding"] = self.encoding
+        _weaken_etag(headers)
+
+    async def _flush_start(self):
+        if self.start is not None:
+            await self.downstream(self.start)
+            self.start = None
+
+def _weaken_etag(headers: MutableHeaders):
+    # the compressed bytes differ from the identity ones, so a strong validator becomes weak
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
@@ -1,5 +1,5 @@
 from pydantic import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -18,18 +18,125 @@ class Settings(BaseSettings):
     # redis
     redis_url: str = "redis://localhost:6379"
     redis_enabled: bool = True
+    redis_max_connections: int = 50
 
     # rate limiting
     rate_limit_calls: int = 30
     rate_limit_period: int = 60
+
+    # inbound per-client limits: clients sending one of api_keys in this header
+    # are limited per key, everyone else per IP. trusted_proxy_hops is the number
+    # of proxies in front of the app that append to X-Forwarded-For (0 ignores it)
+    api_key_header: str = "X-API-Key"
+    api_keys: List[str] = []
+    trusted_proxy_hops: int = 0
+    rate_limit_max_local_clients: int = 10000
     
     # NBA API settings
     api_timeout: int = 30
     max_retries: int = 3
+    upstream_max_wait_seconds: int = 120
+
+    # upstream adapter: "live", "record" (save raw responses to the store) or
+    # "replay" (serve them back offline with injected latency and errors)
+    upstream_mode: str = "live"
+    upstream_store_dir: str = "./upstream_store"
+    upstream_replay_latency_ms: Optional[float] = None  # None replays the recorded latency
+    upstream_replay_jitter_ms: float = 0.0
+    upstream_replay_error_rate: float = 0.0
+    upstream_replay_seed: Optional[int] = None
+    upstream_replay_fallthrough: bool = False  # call upstream when nothing was recorded
     
     # cache settings
     cache_ttl_minutes: int = 60
     player_cache_ttl_hours: int = 24
+
+    # cache codec compression for DataFrames ("zlib" or "none")
+    cache_compression: str = "zlib"
+    cache_compression_level: int = 1
+    cache_compression_min_bytes: int = 4096
+
+    # in-memory cache (used when Redis is unavailable)
+    memory_cache_max_bytes: int = 256 * 1024 * 1024
+    memory_cache_max_entries: int = 50000
+    memory_cache_namespace_limits: Dict[str, int] = {
+        "shot_chart": 128 * 1024 * 1024,
+        "player_career": 32 * 1024 * 1024,
+        "team_stats": 8 * 1024 * 1024
+    }
+    memory_cache_sweep_seconds: int = 60
+
+    # process-local L1 in front of Redis
+    l1_cache_max_bytes: int = 64 * 1024 * 1024
+    l1_cache_max_entries: int = 2000
+    l1_cache_ttl_seconds: int = 300
+
+    # keys per SCAN/UNLINK round-trip in background pattern sweeps
+    cache_scan_batch: int = 500
+
+    # Cache-Control max-age for responses with ETags (clients revalidate after it)
+    http_cache_max_age_seconds: int = 5
+    # upper bound on how long a rendered response is kept (source changes drop it sooner)
+    response_cache_ttl_minutes: int = 30
+
+    # response compression (br/zstd need the optional brotli/zstandard packages)
+    compression_enabled: bool = True
+    compression_min_bytes: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+    compression_zstd_level: int = 3
+    # per-worker cache of compressed bodies, so hot payloads are compressed once
+    compression_cache_max_bytes: int = 32 * 1024 * 1024
+    compression_cache_max_entries: int = 1000
+    compression_cache_ttl_seconds: int = 600
+
+    # name resolution - minimum trigram similarity for typo-tolerant matches
+    name_match_min_score: float = 0.45
+
+    # single-flight coalescing of upstream fetches
+    single_flight_lock_seconds: int = 30
+    single_flight_poll_ms: int = 100
+
+    # stat warehouse (completed seasons never expire)
+    warehouse_enabled: bool = True
+    warehouse_career_max_age_hours: int = 24
+    warehouse_shot_chart_max_age_hours: int = 24
+    warehouse_team_stats_max_age_hours: int = 6
+
+    # matchup simulation - counts above the chunk size go to a process pool
+    simulation_chunk_size: int = 2500
+    simulation_workers: int = 2
+    simulation_cache_minutes: int = 30
+
+    # concurrent player loads per compare-players request
+    compare_max_concurrency: int = 4
+
+    # league percentile qualifiers (per-game minutes and games played)
+    percentile_min_minutes: float = 15.0
+    percentile_min_games: int = 10
+    # seasons with an in-process percentile table (least recently used dropped first)
+    percentile_max_tables: int = 8
+
+    # minutes between trending engine top-ups from the league game log
+    trending_refresh_minutes: int = 15
+
+    # stale-while-revalidate: data TTLs are the soft expiry, hard expiry is
+    # TTL x factor, and entries are kept this much longer to serve on upstream errors
+    swr_hard_ttl_factor: float = 2.0
+    stale_if_error_minutes: int = 24 * 60
+    serve_stale_on_error: bool = True
+
+    # refresh-ahead cache warmer
+    warmer_enabled: bool = True
+    warmer_interval_seconds: int = 30
+    warmer_refresh_fraction: float = 0.8
+    warmer_jitter_fraction: float = 0.05
+    warmer_top_keys: int = 20
+    # request counts behind the hot set halve every half-life; at most this many keys are tracked
+    warmer_count_half_life_seconds: int = 1800
+    warmer_max_tracked_keys: int = 10000
+    # share of the upstream bucket the warmer leaves free for live requests
+    warmer_quota_reserve: float = 0.5
     
     class Config:
         env_file = ".env"
@@ -4,6 +4,9 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from .config import settings
 
+# sqlite connections are handed between the executor threads
+connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+
 # database engine with connection pooling
 engine = create_engine(
     settings.database_url,
@@ -12,6 +15,7 @@ engine = create_engine(
     max_overflow=20,
     pool_recycle=300,
     pool_pre_ping=True,
+    connect_args=connect_args,
     echo=settings.debug
 )
 
@@ -24,4 +28,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def init_db():
+    """Create all tables registered on Base"""
+    # import models so they register on Base.metadata
+    from ..models import tables  # noqa: F401
+    Base.metadata.create_all(bind=engine)
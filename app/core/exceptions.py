@@ -16,4 +16,8 @@ class RateLimitExceededError(NBAAPIError):
 
 class DataProcessingError(NBAAPIError):
     """ Raised when data processing fails """
-    pass
\ No newline at end of file
+    pass
+
+class UpstreamReplayMissError(NBAAPIError):
+    """ Raised in replay mode when no response was recorded for a call """
+    pass
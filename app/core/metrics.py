@@ -0,0 +1,142 @@
+import os
+import time
+from typing import Callable
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess
+)
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .middleware import response_state, request_state
+
+# With PROMETHEUS_MULTIPROC_DIR set (required for uvicorn --workers > 1) every
+# worker writes its samples to files in that directory and /metrics merges
+# them. The directory must exist and be emptied before the server starts.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"]
+)
+
+REQUEST_ROWS = Histogram(
+    "http_request_rows_processed",
+    "DataFrame rows behind each response",
+    ["route"],
+    buckets=(0, 10, 100, 1000, 5000, 10000, 50000, 100000, 500000)
+)
+
+CACHE_EVENTS = Counter(
+    "cache_events_total",
+    "Cache lookups and writes by key namespace, tier and result",
+    ["namespace", "tier", "result"]
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "nba_api call latency per endpoint (excluding quota wait)",
+    ["endpoint", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+)
+
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Failed nba_api attempts that were retried",
+    ["endpoint"]
+)
+
+RATE_LIMIT_WAIT = Histogram(
+    "upstream_rate_limit_wait_seconds",
+    "Time spent waiting for an upstream token",
+    ["priority"],
+    buckets=(0, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120)
+)
+
+EXECUTOR_QUEUED = Gauge(
+    "executor_queue_depth",
+    "Tasks submitted to an executor and not yet started",
+    ["executor"],
+    multiprocess_mode="livesum"
+)
+
+EXECUTOR_IN_FLIGHT = Gauge(
+    "executor_in_flight",
+    "Tasks currently running on an executor",
+    ["executor"],
+    multiprocess_mode="livesum"
+)
+
+def track_executor(executor: str, func: Callable) -> Callable:
+    """Wrap a callable about to be submitted to an executor with queue/in-flight gauges"""
+    EXECUTOR_QUEUED.labels(executor).inc()
+
+    def run():
+        EXECUTOR_QUEUED.labels(executor).dec()
+        EXECUTOR_IN_FLIGHT.labels(executor).inc()
+        try:
+            return func()
+        finally:
+            EXECUTOR_IN_FLIGHT.labels(executor).dec()
+
+    return run
+
+def record_rows(rows: int):
+    """Count DataFrame rows used to build the current response"""
+    state = response_state.get()
+    if state is not None:
+        state["rows"] = state.get("rows", 0) + rows
+
+def _route_template(scope: Scope) -> str:
+    """Route path template ("/players/evolution/{player_name}") to keep label cardinality bounded"""
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "<unmatched>"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and rows processed per route"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message: Message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        with request_state() as state:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = _route_template(scope)
+                REQUEST_LATENCY.labels(scope["method"], route, str(status["code"])).observe(time.perf_counter() - start)
+                if "rows" in state:
+                    REQUEST_ROWS.labels(route).observe(state["rows"])
+
+def metrics_response_body() -> bytes:
+    """Exposition for /metrics, merged across workers in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# per-request state that the data layer can write to while a request is handled;
+# a mutable dict so writes made in child tasks/contexts are still visible here
+response_state: ContextVar[Optional[Dict[str, Any]]] = ContextVar("response_state", default=None)
+
+@contextmanager
+def request_state() -> Iterator[Dict[str, Any]]:
+    """The current request's state dict, created if no outer middleware set one"""
+    state = response_state.get()
+    if state is not None:
+        yield state
+        return
+
+    state = {}
+    token = response_state.set(state)
+    try:
+        yield state
+    finally:
+        response_state.reset(token)
+
+def mark_stale(age_seconds: float, revalidation_failed: bool = False):
+    """Record that the current response is built from data past its soft expiry"""
+    state = response_state.get()
+    if state is None:
+        return
+    state["stale_seconds"] = max(state.get("stale_seconds", 0.0), age_seconds)
+    state["revalidation_failed"] = state.get("revalidation_failed", False) or revalidation_failed
+
+class StalenessHeaderMiddleware:
+    """
+    Pure ASGI middleware that adds X-Data-Stale (seconds past soft expiry)
+    and a Warning header when any data behind the response was stale.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_staleness(message: Message):
+            if message["type"] == "http.response.start" and "stale_seconds" in state:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Data-Stale", str(int(state["stale_seconds"])))
+                if state["revalidation_failed"]:
+                    headers.append("Warning", '111 - "Revalidation Failed"')
+                else:
+                    headers.append("Warning", '110 - "Response is Stale"')
+            await send(message)
+
+        with request_state() as state:
+            await self.app(scope, receive, send_with_staleness)
@@ -0,0 +1,48 @@
+import datetime
+import decimal
+from typing import Any
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def _default(value: Any) -> Any:
+    """Types orjson doesn't serialize natively"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (datetime.timedelta, pd.Timedelta)):
+        return value.total_seconds()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    """orjson with NumPy arrays/scalars, datetimes, pandas scalars and pydantic models; NaN becomes null"""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+class FastJSONResponse(ORJSONResponse):
+    """App-wide default response class, serialized with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def trusted_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """
+    Serialize a payload directly, skipping the route's response_model pass
+    (validation plus jsonable_encoder). Only for payloads already shaped
+    exactly like the model and range-checked when built, e.g. records from
+    response_builder.build_records. The response_model still documents the
+    route in OpenAPI.
+    """
+    return FastJSONResponse(content, status_code=status_code)
@@ -1,13 +1,26 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import sys
 
 # import routers
 from .routers import players, teams, analytics
 from .core.config import settings
+from .core.middleware import StalenessHeaderMiddleware
+from .core.compression import CompressionMiddleware, compression_stats
+from .core.responses import FastJSONResponse
+from .core.metrics import MetricsMiddleware, metrics_response_body, METRICS_CONTENT_TYPE
 from .core.exceptions import PlayerNotFoundError, TeamNotFoundError, RateLimitExceededError, NBAAPIError
+from .services.warehouse_service import warehouse_service
+from .services.cache_service import cache_service
+from .services.name_index import player_index, team_index
+from .services.simulation import start_pool, shutdown_pool
+from .services.cache_warmer import cache_warmer
+from .services.upstream import upstream_adapter
+from .utils.token_bucket import upstream_limiter
 
 # configure logging
 logging.basicConfig(
@@ -21,11 +34,31 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # startup
+    await cache_service.connect()
+    warehouse_service.initialize()
+    player_index.build()
+    team_index.build()
+    start_pool()
+    sweeper = asyncio.create_task(cache_service.memory.sweep_forever(settings.memory_cache_sweep_seconds))
+    warmer = asyncio.create_task(cache_warmer.run_forever()) if settings.warmer_enabled else None
+    yield
+    # shutdown
+    sweeper.cancel()
+    if warmer is not None:
+        warmer.cancel()
+    shutdown_pool()
+    await cache_service.close()
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     debug=settings.debug,
-    description="Advanced NBA Analytics API with comprehensive player and team statistics"
+    description="Advanced NBA Analytics API with comprehensive player and team statistics",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -35,8 +68,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=["X-Data-Stale", "Warning", "Retry-After", "ETag"],
 )
 
+# flags responses served from stale cache entries
+app.add_middleware(StalenessHeaderMiddleware)
+
+# gzip/br/zstd for large JSON bodies (sees the final ETag and headers)
+if settings.compression_enabled:
+    app.add_middleware(CompressionMiddleware)
+
+# request latency and rows processed (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
 # exception handlers
 @app.exception_handler(PlayerNotFoundError)
 async def player_not_found_handler(request: Request, exc: PlayerNotFoundError):
@@ -89,9 +133,18 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "version": settings.app_version
+        "version": settings.app_version,
+        "upstream_quota": await upstream_limiter.status(),
+        "upstream": upstream_adapter.stats(),
+        "cache": cache_service.stats(),
+        "compression": compression_stats()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics (merged across workers when PROMETHEUS_MULTIPROC_DIR is set)"""
+    return Response(metrics_response_body(), media_type=METRICS_CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
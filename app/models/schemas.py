@@ -7,6 +7,11 @@ class Season(str, Enum):
     CURRENT = "2023-24"
     PREVIOUS = "2022-23"
 
+class ShotChartMode(str, Enum):
+    SHOTS = "shots"
+    HEXBIN = "hexbin"
+    ZONES = "zones"
+
 class PlayerArchetype(str, Enum):
     VERSATILE_SUPERSTAR = "Versatile Superstar"
     ELITE_SCORER = "Elite Scorer"
@@ -48,12 +53,19 @@ class CareerSummary(BaseModel):
     career_apg: float = Field(ge=0)
     career_rpg: float = Field(ge=0)
 
+class LeaguePercentiles(BaseModel):
+    season: str
+    qualified: bool
+    qualified_players: int = Field(ge=0)
+    percentiles: Dict[str, float]
+
 class PlayerEvolutionResponse(BaseModel):
     player_name: str
     seasons: List[SeasonStats]
     archetype: PlayerArchetype
     milestones: List[str]
     career_summary: CareerSummary
+    league_percentiles: Optional[LeaguePercentiles] = None
 
 class ShotData(BaseModel):
     x: float
@@ -74,6 +86,25 @@ class ShotChartResponse(BaseModel):
     shots: List[ShotData]
     summary: ShotChartSummary
 
+class ShotBin(BaseModel):
+    x: Optional[float] = None
+    y: Optional[float] = None
+    zone: Optional[str] = None
+    area: Optional[str] = None
+    attempts: int = Field(ge=0)
+    makes: int = Field(ge=0)
+    fg_pct: float = Field(ge=0, le=1)
+    league_fg_pct: Optional[float] = Field(default=None, ge=0, le=1)
+    fg_pct_vs_league: Optional[float] = Field(default=None, ge=-1, le=1)
+
+class ShotChartBinsResponse(BaseModel):
+    player_name: str
+    season: str
+    mode: ShotChartMode
+    bin_size: Optional[float] = None
+    bins: List[ShotBin]
+    summary: ShotChartSummary
+
 class TeamStats(BaseModel):
     team: str
     team_id: int
@@ -98,11 +129,24 @@ class MatchupRequest(BaseModel):
     pace: float = Field(default=100.0, ge=80, le=120)
     simulations: int = Field(default=1000, ge=100, le=10000)
     era_rules: str = Field(default="modern")
+    season: Season = Season.CURRENT
 
 class PlayerComparison(BaseModel):
     players: List[str] = Field(min_items=2, max_items=10)
     season: str = "2023-24"
     stats: List[str] = ["PTS", "AST", "REB", "PER", "TS_PCT"]
+    
+    @validator('players')
+    def dedupe_players(cls, v):
+        # names are matched case-insensitively, so "lebron james" repeats "LeBron James"
+        unique = {}
+        for name in v:
+            unique.setdefault(name.strip().casefold(), name)
+        return list(unique.values())
+    
+    @validator('stats')
+    def dedupe_stats(cls, v):
+        return list(dict.fromkeys(v))
 
 class AIInsightRequest(BaseModel):
     query: str = Field(min_length=1, max_length=500)
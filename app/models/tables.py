@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Index
+from datetime import datetime
+
+from ..core.database import Base
+
+# Each table keeps the columns we filter on as real columns and the full
+# nba_api row in `data`, so frames rebuilt from the warehouse have the same
+# shape as the ones returned upstream. `row_index` preserves upstream order.
+
+class PlayerCareerSeason(Base):
+    __tablename__ = "player_career_seasons"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    player_id = Column(Integer, nullable=False, index=True)
+    row_index = Column(Integer, nullable=False)
+    season_id = Column(String(10))
+    team_id = Column(Integer)
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class ShotEvent(Base):
+    __tablename__ = "shot_events"
+    __table_args__ = (
+        Index("ix_shot_events_player_season", "player_id", "season"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    player_id = Column(Integer, nullable=False)
+    season = Column(String(10), nullable=False)
+    row_index = Column(Integer, nullable=False)
+    game_id = Column(String(12))
+    game_event_id = Column(Integer)
+    loc_x = Column(Float)
+    loc_y = Column(Float)
+    shot_made_flag = Column(Integer)
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class TeamSeasonStat(Base):
+    __tablename__ = "team_season_stats"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    season = Column(String(10), nullable=False, index=True)
+    row_index = Column(Integer, nullable=False)
+    team_id = Column(Integer)
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
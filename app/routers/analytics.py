@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query, Body
+import asyncio
 from typing import List, Dict, Any, Optional
 import pandas as pd
 import numpy as np
@@ -11,81 +12,136 @@ from ..models.schemas import (
     Season
 )
 from ..services.nba_service import nba_service
+from ..services.cache_service import cache_service
+from ..services.percentile_service import percentile_service
+from ..services.trending_service import trending_service, TRENDING_METRICS, TIMEFRAMES
+from ..services.simulation import ERA_RULES, run_simulation
+from ..core.config import settings
 from ..core.exceptions import PlayerNotFoundError, TeamNotFoundError, DataProcessingError
 from ..utils.rate_limiter import rate_limit
+from ..utils.helpers import calculate_advanced_stats
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+async def _load_comparison_row(player_name: str, season: str, semaphore: asyncio.Semaphore):
+    """One player's ID and stat line for a comparison: a season row or career averages"""
+    async with semaphore:
+        player_id = await nba_service.get_player_id(player_name)
+        if not player_id:
+            raise PlayerNotFoundError(f"Player '{player_name}' not found")
+        
+        # get career stats
+        career_df = await nba_service.get_player_career_stats(player_id)
+    
+    if career_df.empty:
+        raise DataProcessingError(f"No career data found for {player_name}")
+    career_df = calculate_advanced_stats(career_df)
+    
+    # filter by season if specified
+    if season != "career":
+        season_df = career_df[career_df['SEASON_ID'] == season]
+        if season_df.empty:
+            raise DataProcessingError(f"No data found for {player_name} in {season}")
+        return player_id, season_df.iloc[-1]
+    
+    # using career averages
+    return player_id, career_df.select_dtypes(include=[np.number]).mean()
+
+def _comparison_failure(player_name: str, error: Exception) -> Dict[str, str]:
+    """Per-player failure entry for a partial comparison"""
+    if isinstance(error, PlayerNotFoundError):
+        reason = "not_found"
+    elif isinstance(error, DataProcessingError):
+        reason = "no_data"
+    else:
+        reason = "upstream_error"
+        logger.error(f"Error loading comparison data for {player_name}: {error}")
+    return {"player": player_name, "reason": reason, "detail": str(error)}
+
 @router.post("/compare-players")
 @rate_limit(calls_per_minute=5)
 async def compare_players(comparison: PlayerComparison):
     """
     Compare multiple players across specified statistics.
-    Returns detailed comparison with percentile rankings and insights.
+    Returns detailed comparison with rankings, league-wide percentiles
+    (season comparisons) and insights.
+    Players are loaded concurrently; players that fail to load are listed
+    under "failed" and the rest are still compared.
     """
     try:
         if len(comparison.players) < 2:
             raise HTTPException(status_code=400, detail="At least 2 players required for comparison")
         
-        # get player data for comparison
-        player_data = {}
-        for player_name in comparison.players:
-            player_id = await nba_service.get_player_id(player_name)
-            if not player_id:
-                raise PlayerNotFoundError(f"Player '{player_name}' not found")
-            
-            # get career stats
-            career_df = await nba_service.get_player_career_stats(player_id)
-            
-            # filter by season if specified
-            if comparison.season != "career":
-                season_df = career_df[career_df['SEASON_ID'] == comparison.season]
-                if season_df.empty:
-                    raise HTTPException(
-                        status_code=404, 
-                        detail=f"No data found for {player_name} in {comparison.season}"
-                    )
-                player_data[player_name] = season_df.iloc[-1].to_dict()
+        # fan out, bounded so a cold comparison doesn't flood the upstream queue
+        semaphore = asyncio.Semaphore(settings.compare_max_concurrency)
+        results = await asyncio.gather(
+            *[_load_comparison_row(name, comparison.season, semaphore) for name in comparison.players],
+            return_exceptions=True
+        )
+        
+        player_ids = {}
+        rows = {}
+        failed = []
+        for player_name, result in zip(comparison.players, results):
+            if isinstance(result, Exception):
+                failed.append(_comparison_failure(player_name, result))
             else:
-                # using career averages
-                numeric_columns = career_df.select_dtypes(include=[np.number]).columns
-                player_data[player_name] = career_df[numeric_columns].mean().to_dict()
+                player_ids[player_name], rows[player_name] = result
         
-        # build comparison result
-        comparison_result = {
-            "comparison_type": "season" if comparison.season != "career" else "career",
-            "season": comparison.season,
-            "players": comparison.players,
-            "stats": {},
-            "rankings": {},
-            "insights": []
-        }
+        if len(rows) < 2:
+            upstream_failed = any(f["reason"] == "upstream_error" for f in failed)
+            raise HTTPException(
+                status_code=503 if upstream_failed else 404,
+                detail={"message": "At least 2 players with data are required for comparison", "failed": failed}
+            )
         
-        # compare requested stats
+        # one row per player, one column per requested stat
+        players = list(rows)
+        stats_df = (
+            pd.DataFrame(rows.values(), index=players)
+            .reindex(columns=comparison.stats)
+            .apply(pd.to_numeric, errors='coerce')
+            .fillna(0.0)
+            .astype(float)
+        )
+        
+        # rank players per stat, ties keep request order
+        ranks = stats_df.rank(method='first', ascending=False).astype(int)
+        rankings = {}
         for stat in comparison.stats:
-            stat_values = {}
-            for player_name in comparison.players:
-                value = player_data[player_name].get(stat, 0)
-                stat_values[player_name] = float(value) if value is not None else 0.0
-            
-            comparison_result["stats"][stat] = stat_values
-            
-            # rank players for this stat
-            sorted_players = sorted(stat_values.items(), key=lambda x: x[1], reverse=True)
-            comparison_result["rankings"][stat] = [{"player": p, "value": v, "rank": i+1} 
-                                                 for i, (p, v) in enumerate(sorted_players)]
+            order = ranks[stat].sort_values(kind='stable').index
+            rankings[stat] = [
+                {"player": player, "value": value, "rank": rank}
+                for player, value, rank in zip(order, stats_df.loc[order, stat].tolist(), ranks.loc[order, stat].tolist())
+            ]
         
         # generate insights
-        insights = []
-        for stat in comparison.stats:
-            best_player = comparison_result["rankings"][stat][0]
-            insights.append(f"{best_player['player']} leads in {stat} with {best_player['value']:.1f}")
+        leaders = ranks.idxmin()
+        insights = [
+            f"{leaders[stat]} leads in {stat} with {stats_df.at[leaders[stat], stat]:.1f}"
+            for stat in comparison.stats
+        ]
         
-        comparison_result["insights"] = insights
+        # percentiles against every qualified player in the league (season comparisons only)
+        league_percentiles = None
+        if comparison.season != "career":
+            league_percentiles = {
+                player: await percentile_service.player_percentiles(player_ids[player], comparison.season, comparison.stats)
+                for player in players
+            }
         
-        return comparison_result
+        return {
+            "comparison_type": "season" if comparison.season != "career" else "career",
+            "season": comparison.season,
+            "players": players,
+            "stats": stats_df.to_dict(),
+            "rankings": rankings,
+            "league_percentiles": league_percentiles,
+            "insights": insights,
+            "failed": failed
+        }
         
     except (PlayerNotFoundError, HTTPException):
         raise
@@ -98,7 +154,10 @@ async def compare_players(comparison: PlayerComparison):
 async def simulate_team_matchup(matchup: MatchupRequest):
     """
     Simulate team matchup with advanced analytics.
-    Provides win probability, predicted score, and key factors.
+    Runs a Monte Carlo simulation of possessions and scoring under the
+    requested era's rules; provides win probability with a 95% interval,
+    score and margin distributions, and key factors. Margins are from
+    team1's point of view.
     """
     try:
         # get team IDs
@@ -110,8 +169,21 @@ async def simulate_team_matchup(matchup: MatchupRequest):
         if not team2_id:
             raise TeamNotFoundError(f"Team '{matchup.team2}' not found")
         
-        # get current season team stats
-        team_stats_df = await nba_service.get_team_stats("2023-24")
+        if matchup.era_rules not in ERA_RULES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown era_rules '{matchup.era_rules}'. Options: {', '.join(ERA_RULES)}"
+            )
+        
+        cache_key = (
+            f"matchup_sim:{team1_id}:{team2_id}:{matchup.pace:g}:"
+            f"{matchup.season.value}:{matchup.era_rules}:{matchup.simulations}"
+        )
+        # resolved before reading team stats: a refresh with new ratings moves the key to a new generation
+        scoped_key = await cache_service.scoped_key(cache_key, f"team_stats:{matchup.season.value}")
+        
+        # get team stats for the requested season
+        team_stats_df = await nba_service.get_team_stats(matchup.season.value)
         
         team1_stats = team_stats_df[team_stats_df['TEAM_ID'] == team1_id]
         team2_stats = team_stats_df[team_stats_df['TEAM_ID'] == team2_id]
@@ -123,21 +195,25 @@ async def simulate_team_matchup(matchup: MatchupRequest):
         team1_data = team1_stats.iloc[0]
         team2_data = team2_stats.iloc[0]
         
-        # simple matchup simulation (enhance this with more sophisticated models if needed)
         team1_off_rating = float(team1_data.get('OFF_RATING', 110))
         team1_def_rating = float(team1_data.get('DEF_RATING', 110))
         team2_off_rating = float(team2_data.get('OFF_RATING', 110))
         team2_def_rating = float(team2_data.get('DEF_RATING', 110))
         
-        # predict scores based on pace and ratings
-        possessions = matchup.pace * 48 / 48  # simplified pace calculation
+        # expected points per 100 possessions: each offense against the other defense
+        team1_efficiency = (team1_off_rating + team2_def_rating) / 2
+        team2_efficiency = (team2_off_rating + team1_def_rating) / 2
         
-        team1_predicted_score = (team1_off_rating + (120 - team2_def_rating)) / 2 * possessions / 100
-        team2_predicted_score = (team2_off_rating + (120 - team1_def_rating)) / 2 * possessions / 100
+        result = await cache_service.get(scoped_key)
+        if result is None:
+            result = await run_simulation(
+                team1_efficiency, team2_efficiency, matchup.pace,
+                matchup.era_rules, matchup.simulations, cache_key
+            )
+            await cache_service.set(scoped_key, result, settings.simulation_cache_minutes)
         
-        # calculate win probability (simplified logistic model)
-        score_diff = team1_predicted_score - team2_predicted_score
-        team1_win_prob = 1 / (1 + np.exp(-score_diff / 10))
+        team1_win_prob = result["team1_win_probability"]
+        low, high = result["team1_win_probability_ci95"]
         
         # key factors
         factors = []
@@ -154,18 +230,32 @@ async def simulate_team_matchup(matchup: MatchupRequest):
         return {
             "matchup": f"{matchup.team1} vs {matchup.team2}",
             "predicted_score": {
-                matchup.team1: round(team1_predicted_score, 1),
-                matchup.team2: round(team2_predicted_score, 1)
+                matchup.team1: result["team1_score"]["mean"],
+                matchup.team2: result["team2_score"]["mean"]
             },
             "win_probability": {
                 matchup.team1: round(team1_win_prob, 3),
                 matchup.team2: round(1 - team1_win_prob, 3)
             },
+            "win_probability_ci95": {
+                matchup.team1: [round(low, 3), round(high, 3)],
+                matchup.team2: [round(1 - high, 3), round(1 - low, 3)]
+            },
+            "score_distribution": {
+                matchup.team1: result["team1_score"],
+                matchup.team2: result["team2_score"]
+            },
+            "margin_distribution": {
+                **result["margin"],
+                "histogram": result["margin_histogram"]
+            },
+            "overtime_pct": round(result["overtime_pct"], 3),
             "key_factors": factors,
             "simulation_params": {
                 "pace": matchup.pace,
                 "simulations": matchup.simulations,
-                "era_rules": matchup.era_rules
+                "era_rules": matchup.era_rules,
+                "season": matchup.season.value
             }
         }
         
@@ -226,24 +316,31 @@ async def get_ai_insights(request: AIInsightRequest):
 async def get_trending_players(
     metric: str = Query("PTS", description="Trending metric (PTS, AST, REB, etc.)"),
     timeframe: str = Query("season", description="Timeframe (season, month, week)"),
-    limit: int = Query(10, ge=1, le=25, description="Number of trending players")
+    limit: int = Query(10, ge=1, le=25, description="Number of trending players"),
+    season: Season = Query(Season.CURRENT, description="NBA season")
 ):
-    """Get trending players based on specified metrics and timeframe"""
+    """
+    Get trending players based on specified metrics and timeframe.
+    Week and month rank players by how far their average in that window
+    is above their season average; season ranks by season average.
+    """
+    metric = metric.upper()
+    if metric not in TRENDING_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric '{metric}'. Options: {', '.join(TRENDING_METRICS)}")
+    if timeframe not in TIMEFRAMES:
+        raise HTTPException(status_code=400, detail=f"Unknown timeframe '{timeframe}'. Options: {', '.join(TIMEFRAMES)}")
+    
     try:
-        # simplified implementation
-        # in prod, you'd track performance changes over time
+        engine = await trending_service.get_engine(season.value)
         
         return {
             "metric": metric,
             "timeframe": timeframe,
-            "trending_players": [
-                {"player": "Example Player 1", "trend": "+15%", "current_avg": 28.5},
-                {"player": "Example Player 2", "trend": "+12%", "current_avg": 25.3},
-                {"player": "Example Player 3", "trend": "+8%", "current_avg": 22.1}
-            ],
-            "note": "Trending analysis requires historical data tracking - this is a placeholder response"
+            "season": season.value,
+            "as_of": engine.as_of,
+            "trending_players": engine.top(metric, timeframe, limit)
         }
         
     except Exception as e:
         logger.error(f"Error getting trending players: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get trending players")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get trending players")
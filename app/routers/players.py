@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional, List
+from fastapi.responses import StreamingResponse
+from typing import Optional, List, Union
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -12,17 +13,59 @@ from ..models.schemas import (
     PlayerArchetype,
     ShotData,
     ShotChartSummary,
+    ShotChartBinsResponse,
+    ShotChartMode,
     Season
 )
 from ..services.nba_service import nba_service
+from ..services.name_index import player_index
+from ..services.percentile_service import percentile_service
 from ..core.exceptions import PlayerNotFoundError, NBAAPIError
-from ..utils.helpers import calculate_advanced_stats, detect_career_milestones, safe_float_conversion, safe_int_conversion
+from ..core.responses import dumps, trusted_response
+from ..utils.helpers import calculate_advanced_stats, detect_career_milestones, safe_float_conversion, season_range
 from ..utils.rate_limiter import rate_limit
+from ..utils.http_cache import conditional_get
+from ..utils.response_cache import cached_response
+from ..utils.response_builder import ColumnSpec, build_records
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# response field <- career frame column
+SEASON_STATS_COLUMNS = [
+    ColumnSpec('season', 'SEASON_ID', 'str'),
+    ColumnSpec('age', 'PLAYER_AGE', 'int', default=25, fill=25),
+    ColumnSpec('team', 'TEAM_ABBREVIATION', 'str', default='UNK', fill='UNK'),
+    ColumnSpec('games', 'GP', 'int'),
+    ColumnSpec('minutes', 'MIN', decimals=1),
+    ColumnSpec('pts', 'PTS', decimals=1),
+    ColumnSpec('ast', 'AST', decimals=1),
+    ColumnSpec('reb', 'REB', decimals=1),
+    ColumnSpec('stl', 'STL', decimals=1),
+    ColumnSpec('blk', 'BLK', decimals=1),
+    ColumnSpec('fg_pct', 'FG_PCT', decimals=3),
+    ColumnSpec('fg3_pct', 'FG3_PCT', decimals=3),
+    ColumnSpec('ft_pct', 'FT_PCT', decimals=3),
+    ColumnSpec('usage_pct', 'USG_PCT'),
+    ColumnSpec('per', 'PER'),
+    ColumnSpec('ts_pct', 'TS_PCT', decimals=3)
+]
+
+SEASON_PATTERN = r"^\d{4}-\d{2}$"
+MAX_STREAM_SEASONS = 25
+STREAM_CHUNK_ROWS = 500
+
+# response field <- shot chart frame column
+SHOT_COLUMNS = [
+    ColumnSpec('x', 'LOC_X'),
+    ColumnSpec('y', 'LOC_Y'),
+    ColumnSpec('made', 'SHOT_MADE_FLAG', 'bool'),
+    ColumnSpec('distance', 'SHOT_DISTANCE', 'int'),
+    ColumnSpec('zone', 'SHOT_ZONE_BASIC', 'str'),
+    ColumnSpec('action', 'ACTION_TYPE', 'str')
+]
+
 def determine_player_archetype(df: pd.DataFrame) -> PlayerArchetype:
     """Determine player archetype based on career stats"""
     try:
@@ -55,6 +98,7 @@ def determine_player_archetype(df: pd.DataFrame) -> PlayerArchetype:
         return PlayerArchetype.ROLE_PLAYER
 
 @router.get("/evolution/{player_name}", response_model=PlayerEvolutionResponse)
+@conditional_get()
 @rate_limit(calls_per_minute=10)
 async def get_player_evolution(
     player_name: str,
@@ -84,27 +128,7 @@ async def get_player_evolution(
         career_df = calculate_advanced_stats(career_df)
         
         # build season stats
-        seasons = []
-        for _, row in career_df.iterrows():
-            season_stat = SeasonStats(
-                season=str(row.get('SEASON_ID', 'Unknown')),
-                age=safe_int_conversion(row.get('PLAYER_AGE'), 25),
-                team=str(row.get('TEAM_ABBREVIATION', 'UNK')),
-                games=safe_int_conversion(row.get('GP')),
-                minutes=safe_float_conversion(row.get('MIN')),
-                pts=safe_float_conversion(row.get('PTS')),
-                ast=safe_float_conversion(row.get('AST')),
-                reb=safe_float_conversion(row.get('REB')),
-                stl=safe_float_conversion(row.get('STL')),
-                blk=safe_float_conversion(row.get('BLK')),
-                fg_pct=safe_float_conversion(row.get('FG_PCT')),
-                fg3_pct=safe_float_conversion(row.get('FG3_PCT')),
-                ft_pct=safe_float_conversion(row.get('FT_PCT')),
-                usage_pct=safe_float_conversion(row.get('USG_PCT')),
-                per=safe_float_conversion(row.get('PER')),
-                ts_pct=safe_float_conversion(row.get('TS_PCT'))
-            )
-            seasons.append(season_stat)
+        seasons = build_records(career_df, SEASON_STATS_COLUMNS, SeasonStats)
         
         # determine archetype
         archetype = determine_player_archetype(career_df)
@@ -120,29 +144,40 @@ async def get_player_evolution(
             career_rpg=safe_float_conversion(career_df['REB'].mean())
         )
         
-        return PlayerEvolutionResponse(
-            player_name=player_name,
-            seasons=seasons,
-            archetype=archetype,
-            milestones=milestones,
-            career_summary=career_summary
+        # league percentiles for the most recent season
+        league_percentiles = await percentile_service.player_percentiles(
+            player_id, str(career_df['SEASON_ID'].iloc[-1])
         )
         
+        return {
+            "player_name": player_name,
+            "seasons": seasons,
+            "archetype": archetype,
+            "milestones": milestones,
+            "career_summary": career_summary,
+            "league_percentiles": league_percentiles
+        }
+        
     except PlayerNotFoundError:
         raise
     except Exception as e:
         logger.error(f"Error getting player evolution for {player_name}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve player evolution data")
 
-@router.get("/shot-chart/{player_name}", response_model=ShotChartResponse)
+@router.get("/shot-chart/{player_name}", response_model=Union[ShotChartResponse, ShotChartBinsResponse])
 @rate_limit(calls_per_minute=5)
+@cached_response()
 async def get_player_shot_chart(
     player_name: str,
-    season: Season = Query(Season.CURRENT, description="NBA season")
+    season: Season = Query(Season.CURRENT, description="NBA season"),
+    mode: ShotChartMode = Query(ShotChartMode.SHOTS, description="Individual shots, hexbin grid or court zones"),
+    bin_size: float = Query(15.0, ge=5, le=100, description="Hexbin spacing in court units (tenths of feet)"),
+    compare_league: bool = Query(False, description="Include league FG% per bin (binned modes only)")
 ):
     """
     Get player shot chart data including shot locations, makes/misses,
-    and shooting zones with summary statistics.
+    and shooting zones with summary statistics. Binned modes return
+    per-bin attempts, makes and FG% instead of individual shots.
     """
     try:
         # get player ID
@@ -156,19 +191,6 @@ async def get_player_shot_chart(
         if shot_df.empty:
             raise HTTPException(status_code=404, detail=f"No shot chart data found for {player_name} in {season.value}")
         
-        # process shot data
-        shots = []
-        for _, row in shot_df.iterrows():
-            shot = ShotData(
-                x=safe_float_conversion(row.get('LOC_X', 0)),
-                y=safe_float_conversion(row.get('LOC_Y', 0)),
-                made=row.get('SHOT_MADE_FLAG', 0) == 1,
-                distance=safe_int_conversion(row.get('SHOT_DISTANCE', 0)),
-                zone=str(row.get('SHOT_ZONE_BASIC', 'Unknown')),
-                action=str(row.get('ACTION_TYPE', 'Unknown'))
-            )
-            shots.append(shot)
-        
         # calculate summary
         total_shots = len(shot_df)
         makes = int(shot_df['SHOT_MADE_FLAG'].sum()) if 'SHOT_MADE_FLAG' in shot_df.columns else 0
@@ -180,12 +202,29 @@ async def get_player_shot_chart(
             fg_pct=round(fg_pct, 3)
         )
         
-        return ShotChartResponse(
-            player_name=player_name,
-            season=season.value,
-            shots=shots,
-            summary=summary
-        )
+        if mode != ShotChartMode.SHOTS:
+            bins = await nba_service.get_shot_chart_bins(
+                player_id, season.value, mode.value, bin_size, compare_league
+            )
+            return {
+                "player_name": player_name,
+                "season": season.value,
+                "mode": mode,
+                "bin_size": bin_size if mode == ShotChartMode.HEXBIN else None,
+                "bins": bins,
+                "summary": summary
+            }
+        
+        # process shot data
+        shots = build_records(shot_df, SHOT_COLUMNS, ShotData)
+        
+        # records are range-checked against ShotData above, so skip the per-row model pass
+        return trusted_response({
+            "player_name": player_name,
+            "season": season.value,
+            "shots": shots,
+            "summary": summary
+        })
         
     except PlayerNotFoundError:
         raise
@@ -193,33 +232,94 @@ async def get_player_shot_chart(
         logger.error(f"Error getting shot chart for {player_name}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve shot chart data")
 
+@router.get("/shot-chart/{player_name}/stream")
+@rate_limit(calls_per_minute=5)
+async def stream_player_shot_chart(
+    player_name: str,
+    start_season: str = Query(Season.CURRENT.value, pattern=SEASON_PATTERN, description="First season, e.g. 2019-20"),
+    end_season: Optional[str] = Query(None, pattern=SEASON_PATTERN, description="Last season (defaults to start_season)")
+):
+    """
+    Stream shots as NDJSON, one season after another. Each line is a shot,
+    a per-season summary, or an error for a season that could not be
+    loaded; the overall summary is the last line. Only one season's frame
+    is held in memory at a time.
+    """
+    player_id = await nba_service.get_player_id(player_name)
+    if not player_id:
+        raise PlayerNotFoundError(f"Player '{player_name}' not found")
+    
+    try:
+        seasons = season_range(start_season, end_season or start_season)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not seasons:
+        raise HTTPException(status_code=400, detail="start_season must not be after end_season")
+    if len(seasons) > MAX_STREAM_SEASONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STREAM_SEASONS} seasons per request")
+    
+    async def generate_lines():
+        total_shots = 0
+        total_makes = 0
+        
+        for season in seasons:
+            try:
+                shot_df = await nba_service.get_shot_chart_data(player_id, season)
+            except Exception as e:
+                logger.error(f"Error streaming shot chart for {player_name}, season {season}: {e}")
+                yield dumps({"type": "error", "season": season, "detail": "Failed to retrieve shot chart data"}) + b"\n"
+                continue
+            
+            for start in range(0, len(shot_df), STREAM_CHUNK_ROWS):
+                shots = build_records(shot_df.iloc[start:start + STREAM_CHUNK_ROWS], SHOT_COLUMNS, ShotData)
+                yield b"".join(dumps({"type": "shot", "season": season, **shot}) + b"\n" for shot in shots)
+            
+            makes = int((pd.to_numeric(shot_df['SHOT_MADE_FLAG'], errors='coerce') == 1).sum()) if 'SHOT_MADE_FLAG' in shot_df.columns else 0
+            season_shots = len(shot_df)
+            total_shots += season_shots
+            total_makes += makes
+            del shot_df
+            
+            yield dumps({
+                "type": "season_summary",
+                "season": season,
+                "total_shots": season_shots,
+                "makes": makes,
+                "fg_pct": round(makes / season_shots, 3) if season_shots > 0 else 0.0
+            }) + b"\n"
+        
+        yield dumps({
+            "type": "summary",
+            "player_name": player_name,
+            "seasons": seasons,
+            "total_shots": total_shots,
+            "makes": total_makes,
+            "fg_pct": round(total_makes / total_shots, 3) if total_shots > 0 else 0.0
+        }) + b"\n"
+    
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
 @router.get("/search")
 async def search_players(
     query: str = Query(..., min_length=2, description="Player name search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of results")
 ):
-    """Search for players by name"""
+    """Search for players by name (prefix and typo-tolerant, best matches first)"""
     try:
-        from nba_api.stats.static import players
-        
-        player_list = players.get_players()
-        
-        # filter players by query
-        matches = [
-            {
-                "id": player["id"],
-                "full_name": player["full_name"],
-                "first_name": player["first_name"],
-                "last_name": player["last_name"]
-            }
-            for player in player_list
-            if query.lower() in player["full_name"].lower()
-        ]
+        matches, total_found = player_index.search(query, limit)
         
         return {
             "query": query,
-            "results": matches[:limit],
-            "total_found": len(matches)
+            "results": [
+                {
+                    "id": player["id"],
+                    "full_name": player["full_name"],
+                    "first_name": player["first_name"],
+                    "last_name": player["last_name"]
+                }
+                for player in matches
+            ],
+            "total_found": total_found
         }
         
     except Exception as e:
@@ -1,19 +1,53 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 import pandas as pd
+import numpy as np
 
 from ..models.schemas import TeamStatsResponse, TeamStats, Season
 from ..services.nba_service import nba_service
+from ..services.name_index import team_index
 from ..core.exceptions import TeamNotFoundError, NBAAPIError
-from ..utils.helpers import safe_float_conversion, safe_int_conversion
+from ..core.responses import trusted_response
 from ..utils.rate_limiter import rate_limit
+from ..utils.http_cache import conditional_get
+from ..utils.response_cache import cached_response
+from ..utils.response_builder import ColumnSpec, convert_columns, validate_ranges, to_records
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# response field <- team stats frame column
+TEAM_STATS_COLUMNS = [
+    ColumnSpec('team', 'TEAM_NAME', 'str'),
+    ColumnSpec('team_id', 'TEAM_ID', 'int'),
+    ColumnSpec('games', 'GP', 'int'),
+    ColumnSpec('wins', 'W', 'int'),
+    ColumnSpec('losses', 'L', 'int'),
+    ColumnSpec('win_pct', 'W_PCT'),
+    ColumnSpec('pts', 'PTS'),
+    ColumnSpec('opp_pts', 'OPP_PTS'),
+    ColumnSpec('pace', 'PACE', default=100.0),
+    ColumnSpec('off_rating', 'OFF_RATING', default=110.0),
+    ColumnSpec('def_rating', 'DEF_RATING', default=110.0),
+    ColumnSpec('net_rating', 'NET_RATING', default=0.0)
+]
+
+STANDINGS_COLUMNS = [
+    ColumnSpec('team', 'TEAM_NAME', 'str'),
+    ColumnSpec('wins', 'W', 'int'),
+    ColumnSpec('losses', 'L', 'int'),
+    ColumnSpec('win_pct', 'W_PCT'),
+    ColumnSpec('games_played', 'GP', 'int')
+]
+
+EASTERN_TEAMS = ["Atlantic", "Central", "Southeast", "Celtics", "Nets", "Knicks", "76ers", "Raptors",
+                 "Bulls", "Cavaliers", "Pistons", "Pacers", "Bucks", "Hawks", "Hornets", "Heat", "Magic", "Wizards"]
+
 @router.get("/stats", response_model=TeamStatsResponse)
+@conditional_get()
 @rate_limit(calls_per_minute=15)
+@cached_response()
 async def get_team_stats(
     season: Season = Query(Season.CURRENT, description="NBA season"),
     sort_by: str = Query("WIN_PCT", description="Sort teams by stat (WIN_PCT, PTS, DEF_RTG, etc.)"),
@@ -31,41 +65,26 @@ async def get_team_stats(
             raise HTTPException(status_code=404, detail=f"No team data found for season {season.value}")
         
         # process team data
-        teams = []
-        for _, row in team_df.iterrows():
-            team_stat = TeamStats(
-                team=str(row.get('TEAM_NAME', 'Unknown')),
-                team_id=safe_int_conversion(row.get('TEAM_ID')),
-                games=safe_int_conversion(row.get('GP')),
-                wins=safe_int_conversion(row.get('W')),
-                losses=safe_int_conversion(row.get('L')),
-                win_pct=safe_float_conversion(row.get('W_PCT')),
-                pts=safe_float_conversion(row.get('PTS')),
-                opp_pts=safe_float_conversion(row.get('OPP_PTS')),
-                pace=safe_float_conversion(row.get('PACE', 100.0)),
-                off_rating=safe_float_conversion(row.get('OFF_RATING', 110.0)),
-                def_rating=safe_float_conversion(row.get('DEF_RATING', 110.0)),
-                net_rating=safe_float_conversion(row.get('NET_RATING', 0.0))
-            )
-            teams.append(team_stat)
+        teams = convert_columns(team_df, TEAM_STATS_COLUMNS)
+        validate_ranges(teams, TeamStats)
         
         # sort teams if requested
-        if sort_by and hasattr(TeamStats, sort_by.lower()):
-            teams.sort(
-                key=lambda x: getattr(x, sort_by.lower(), 0),
-                reverse=not ascending
-            )
+        if sort_by and sort_by.lower() in TeamStats.model_fields:
+            teams = teams.sort_values(sort_by.lower(), ascending=ascending, kind='stable')
         
-        return TeamStatsResponse(
-            season=season.value,
-            teams=teams
-        )
+        # columns match TeamStats and were range-checked above
+        return trusted_response({
+            "season": season.value,
+            "teams": to_records(teams)
+        })
         
     except Exception as e:
         logger.error(f"Error getting team stats for season {season.value}: {e}")
         raise HTTPException(status_code=500, detail="Failed to retrieve team statistics")
 
 @router.get("/standings")
+@conditional_get()
+@cached_response()
 async def get_standings(
     season: Season = Query(Season.CURRENT, description="NBA season"),
     conference: Optional[str] = Query(None, description="Filter by conference (East/West)")
@@ -78,38 +97,22 @@ async def get_standings(
             raise HTTPException(status_code=404, detail=f"No standings data found for season {season.value}")
         
         # process standings data
-        standings = []
-        for _, row in team_df.iterrows():
-            team_name = str(row.get('TEAM_NAME', 'Unknown'))
-            
-            # simple conference detection (might want to improve this)
-            conf = "Unknown"
-            eastern_teams = ["Atlantic", "Central", "Southeast", "Celtics", "Nets", "Knicks", "76ers", "Raptors", 
-                           "Bulls", "Cavaliers", "Pistons", "Pacers", "Bucks", "Hawks", "Hornets", "Heat", "Magic", "Wizards"]
-            if any(team in team_name for team in eastern_teams):
-                conf = "East"
-            else:
-                conf = "West"
-            
-            if conference and conf.lower() != conference.lower():
-                continue
-                
-            standings.append({
-                "team": team_name,
-                "conference": conf,
-                "wins": safe_int_conversion(row.get('W')),
-                "losses": safe_int_conversion(row.get('L')),
-                "win_pct": safe_float_conversion(row.get('W_PCT')),
-                "games_played": safe_int_conversion(row.get('GP'))
-            })
+        standings = convert_columns(team_df, STANDINGS_COLUMNS)
+        
+        # simple conference detection (might want to improve this)
+        is_east = standings['team'].str.contains('|'.join(EASTERN_TEAMS), regex=True)
+        standings.insert(1, 'conference', np.where(is_east, "East", "West"))
+        
+        if conference:
+            standings = standings[standings['conference'].str.lower() == conference.lower()]
         
         # sort by win percentage
-        standings.sort(key=lambda x: x["win_pct"], reverse=True)
+        standings = standings.sort_values('win_pct', ascending=False, kind='stable')
         
         return {
             "season": season.value,
             "conference": conference or "All",
-            "standings": standings
+            "standings": to_records(standings)
         }
         
     except Exception as e:
@@ -121,32 +124,24 @@ async def search_teams(
     query: str = Query(..., min_length=2, description="Team name search query"),
     limit: int = Query(10, ge=1, le=30, description="Maximum number of results")
 ):
-    """Search for teams by name or abbreviation"""
+    """Search for teams by name, nickname, city or abbreviation"""
     try:
-        from nba_api.stats.static import teams
-        
-        team_list = teams.get_teams()
-        
-        # filter teams by query
-        matches = [
-            {
-                "id": team["id"],
-                "full_name": team["full_name"],
-                "abbreviation": team["abbreviation"],
-                "nickname": team["nickname"],
-                "city": team["city"],
-                "state": team["state"]
-            }
-            for team in team_list
-            if (query.lower() in team["full_name"].lower() or 
-                query.lower() in team["abbreviation"].lower() or
-                query.lower() in team["nickname"].lower())
-        ]
+        matches, total_found = team_index.search(query, limit)
         
         return {
             "query": query,
-            "results": matches[:limit],
-            "total_found": len(matches)
+            "results": [
+                {
+                    "id": team["id"],
+                    "full_name": team["full_name"],
+                    "abbreviation": team["abbreviation"],
+                    "nickname": team["nickname"],
+                    "city": team["city"],
+                    "state": team["state"]
+                }
+                for team in matches
+            ],
+            "total_found": total_found
         }
         
     except Exception as e:
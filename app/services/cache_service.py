@@ -1,99 +1,364 @@
+import asyncio
+import fnmatch
 import json
-import redis
-from typing import Optional, Any
-from datetime import datetime, timedelta
+import time
+import uuid
+import redis.asyncio as aioredis
+import pandas as pd
+from typing import Dict, Optional, Any, Set
 from ..core.config import settings
+from ..utils.codecs import encode_value, decode_value, CacheEnvelope
+from .memory_cache import MemoryCache, estimate_size, namespace_of
+from ..core.metrics import CACHE_EVENTS
 import logging
 
 logger = logging.getLogger(__name__)
 
+# pub/sub channel used to drop L1 entries in other processes
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+def generation_key(scope: str) -> str:
+    return f"gen:{scope}"
+
 class CacheService:
+    """
+    Two-tier cache: a process-local L1 (MemoryCache holding decoded values)
+    in front of Redis (L2) accessed through redis.asyncio with a connection
+    pool. L2 values are encoded by the codecs in utils.codecs (columnar
+    binary for DataFrames, JSON otherwise). Writes are broadcast over pub/sub
+    so other workers drop their L1 copy. Without Redis the MemoryCache is the
+    only tier and uses the full in-memory limits.
+
+    Derived entries are invalidated by generation rather than by deleting
+    keys: scoped_key() appends the current generation of each scope it
+    depends on, and invalidate() bumps a scope with one INCR, so the old
+    entries are never read again and simply expire. Generation keys have no
+    TTL, so volatile-* eviction policies never drop them; if one is lost
+    anyway (flush, allkeys-* eviction) the next bump restarts it from the
+    Redis clock, above any generation handed out before.
+    """
+
     def __init__(self):
-        if settings.redis_enabled:
+        self.enabled = False
+        self.redis: Optional[aioredis.Redis] = None
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._sweeps: Set[asyncio.Task] = set()
+        # scope generations; mirrors Redis (kept current over pub/sub and re-read
+        # after l1_cache_ttl_seconds) or is the only copy without it
+        self._generations: Dict[str, int] = {}
+        self._generations_read: Dict[str, float] = {}
+
+        # bounded fallback when Redis is unavailable, L1 when it is
+        self.memory = MemoryCache(
+            max_bytes=settings.memory_cache_max_bytes,
+            max_entries=settings.memory_cache_max_entries,
+            namespace_limits=settings.memory_cache_namespace_limits
+        )
+
+    async def connect(self) -> bool:
+        """Connect to Redis and start the invalidation listener"""
+        if not settings.redis_enabled:
+            logger.info("Redis disabled. Using in-memory cache.")
+            return False
+
+        try:
+            pool = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                max_connections=settings.redis_max_connections
+            )
+            self.redis = aioredis.Redis(connection_pool=pool)
+            # test connection
+            await self.redis.ping()
+            self.enabled = True
+            logger.info("Redis cache initialized successfully")
+        except Exception as e:
+            logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
+            self.redis = None
+            self.enabled = False
+            return False
+
+        # shrink the local tier to L1 size
+        self.memory.max_bytes = settings.l1_cache_max_bytes
+        self.memory.max_entries = settings.l1_cache_max_entries
+        self.memory.namespace_limits = {}
+
+        self._listener = asyncio.create_task(self._listen_for_invalidations())
+        return True
+
+    async def close(self):
+        """Stop the invalidation listener and release the connection pool"""
+        if self._listener is not None:
+            self._listener.cancel()
+        for sweep in self._sweeps:
+            sweep.cancel()
+        if self.redis is not None:
+            await self.redis.close()
+            await self.redis.connection_pool.disconnect()
+
+    async def _publish_invalidation(self, **message):
+        """Tell other processes to drop keys from their L1"""
+        try:
+            await self.redis.publish(INVALIDATION_CHANNEL, json.dumps({"origin": self._origin, **message}))
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error for {message}: {e}")
+
+    async def _listen_for_invalidations(self):
+        """Drop L1 entries changed by other processes; reconnects on errors"""
+        while True:
             try:
-                self.redis_client = redis.from_url(settings.redis_url, decode_responses=True)
-                # test connection
-                self.redis_client.ping()
-                self.enabled = True
-                logger.info("Redis cache initialized successfully")
+                pubsub = self.redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") == self._origin:
+                        continue
+                    if "key" in data:
+                        self.memory.delete(data["key"])
+                    elif "pattern" in data:
+                        self._clear_local_pattern(data["pattern"])
+                    elif "generation" in data:
+                        self._mirror_generation(data["generation"], data["value"])
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
-                logger.warning(f"Redis connection failed: {e}. Using in-memory cache.")
-                self.enabled = False
-                self._memory_cache = {}
-                self._cache_ttl = {}
-        else:
-            self.enabled = False
-            self._memory_cache = {}
-            self._cache_ttl = {}
-    
-    def get(self, key: str) -> Optional[Any]:
+                logger.warning(f"Cache invalidation listener error: {e}. Resubscribing.")
+                # entries and generations may have changed while we were disconnected
+                self.memory.clear()
+                self._generations.clear()
+                self._generations_read.clear()
+                await asyncio.sleep(1)
+
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
+        namespace = namespace_of(key)
+        local_tier = "l1" if self.enabled else "memory"
         try:
-            if self.enabled:
-                cached_data = self.redis_client.get(key)
-                return json.loads(cached_data) if cached_data else None
-            else:
-                # in-memory cache with TTL
-                if key in self._memory_cache:
-                    if datetime.now() < self._cache_ttl.get(key, datetime.min):
-                        return self._memory_cache[key]
-                    else:
-                        self._memory_cache.pop(key, None)
-                        self._cache_ttl.pop(key, None)
+            value = self.memory.get(key)
+            CACHE_EVENTS.labels(namespace, local_tier, "miss" if value is None else "hit").inc()
+            if value is not None or not self.enabled:
+                return value
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                cached_data, ttl_ms = await pipe.get(key).pttl(key).execute()
+            if cached_data is None:
+                CACHE_EVENTS.labels(namespace, "redis", "miss").inc()
                 return None
+
+            CACHE_EVENTS.labels(namespace, "redis", "hit").inc()
+            value = decode_value(cached_data)
+            if ttl_ms and ttl_ms > 0:
+                self.memory.set(key, value, min(ttl_ms / 1000, settings.l1_cache_ttl_seconds), size=_local_size(value, cached_data))
+            return value
         except Exception as e:
+            CACHE_EVENTS.labels(namespace, "redis" if self.enabled else "memory", "error").inc()
             logger.error(f"Cache get error for key {key}: {e}")
             return None
-    
-    def set(self, key: str, value: Any, ttl_minutes: int = None) -> bool:
+
+    async def set(self, key: str, value: Any, ttl_minutes: int = None) -> bool:
         """Set value in cache with TTL"""
+        namespace = namespace_of(key)
         try:
             ttl = ttl_minutes or settings.cache_ttl_minutes
-            
+
             if self.enabled:
-                return self.redis_client.setex(
-                    key, 
-                    ttl * 60, 
-                    json.dumps(value, default=str)
-                )
+                encoded = encode_value(value)
+                stored = await self.redis.setex(key, ttl * 60, encoded)
+                self.memory.set(key, value, min(ttl * 60, settings.l1_cache_ttl_seconds), size=_local_size(value, encoded))
+                await self._publish_invalidation(key=key)
+                CACHE_EVENTS.labels(namespace, "redis", "set").inc()
+                return bool(stored)
             else:
-                # in-memory cache
-                self._memory_cache[key] = value
-                self._cache_ttl[key] = datetime.now() + timedelta(minutes=ttl)
-                return True
+                CACHE_EVENTS.labels(namespace, "memory", "set").inc()
+                return self.memory.set(key, value, ttl * 60)
         except Exception as e:
+            CACHE_EVENTS.labels(namespace, "redis" if self.enabled else "memory", "error").inc()
             logger.error(f"Cache set error for key {key}: {e}")
             return False
-    
-    def delete(self, key: str) -> bool:
+
+    async def delete(self, key: str) -> bool:
         """Delete value from cache"""
         try:
+            self.memory.delete(key)
             if self.enabled:
-                return bool(self.redis_client.delete(key))
-            else:
-                self._memory_cache.pop(key, None)
-                self._cache_ttl.pop(key, None)
-                return True
+                deleted = bool(await self.redis.delete(key))
+                await self._publish_invalidation(key=key)
+                return deleted
+            return True
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
-    
-    def clear_pattern(self, pattern: str) -> int:
-        """Clear all keys matching pattern"""
+
+    async def ttl(self, key: str) -> Optional[float]:
+        """Seconds until a key expires in the shared tier, None if missing"""
         try:
             if self.enabled:
-                keys = self.redis_client.keys(pattern)
-                return self.redis_client.delete(*keys) if keys else 0
-            else:
-                # in-memory pattern matching
-                matching_keys = [k for k in self._memory_cache.keys() if pattern.replace('*', '') in k]
-                for key in matching_keys:
-                    self._memory_cache.pop(key, None)
-                    self._cache_ttl.pop(key, None)
-                return len(matching_keys)
+                ttl_ms = await self.redis.pttl(key)
+                return ttl_ms / 1000 if ttl_ms > 0 else None
+            return self.memory.ttl(key)
+        except Exception as e:
+            logger.error(f"Cache ttl error for key {key}: {e}")
+            return None
+
+    def _mirror_generation(self, scope: str, value: int):
+        """Record a generation read from Redis or pub/sub; generations only move forward"""
+        self._generations[scope] = max(self._generations.get(scope, 0), value)
+        self._generations_read[scope] = time.monotonic()
+
+    async def generations(self, *scopes: str) -> Dict[str, int]:
+        """Current generation of each scope (0 until first invalidated)"""
+        if not self.enabled:
+            return {scope: self._generations.setdefault(scope, 0) for scope in scopes}
+
+        # re-read mirrored values now and then in case a pub/sub update was missed
+        oldest = time.monotonic() - settings.l1_cache_ttl_seconds
+        due = [scope for scope in scopes if self._generations_read.get(scope, oldest) <= oldest]
+        if due:
+            try:
+                values = await self.redis.mget([generation_key(scope) for scope in due])
+                for scope, value in zip(due, values):
+                    self._mirror_generation(scope, int(value or 0))
+            except Exception as e:
+                logger.error(f"Cache generation read error for {due}: {e}")
+        return {scope: self._generations.get(scope, 0) for scope in scopes}
+
+    async def scoped_key(self, key: str, *scopes: str) -> str:
+        """
+        A key qualified by the generations of the scopes its value was built
+        from, e.g. shot bins by the shot chart they were binned from. Resolve
+        it before reading the sources, so a concurrent invalidation can only
+        leave a newer value under an older key, never the reverse.
+        """
+        if not scopes:
+            return key
+        generations = await self.generations(*scopes)
+        return f"{key}:g" + ".".join(str(generations[scope]) for scope in scopes)
+
+    async def invalidate(self, *scopes: str):
+        """Invalidate everything built from the scopes: one INCR each, old entries age out"""
+        for scope in scopes:
+            try:
+                if self.enabled:
+                    value = int(await self.redis.eval(_BUMP_GENERATION_SCRIPT, 1, generation_key(scope)))
+                    self._mirror_generation(scope, value)
+                    await self._publish_invalidation(generation=scope, value=value)
+                else:
+                    self._generations[scope] = self._generations.get(scope, 0) + 1
+                CACHE_EVENTS.labels(namespace_of(scope), "redis" if self.enabled else "memory", "invalidate").inc()
+            except Exception as e:
+                logger.error(f"Cache invalidate error for {scope}: {e}")
+
+    def _clear_local_pattern(self, pattern: str) -> int:
+        """Clear keys matching a glob-style pattern from the local tier"""
+        matching_keys = [k for k in self.memory.keys() if fnmatch.fnmatchcase(k, pattern)]
+        for key in matching_keys:
+            self.memory.delete(key)
+        return len(matching_keys)
+
+    async def _sweep_pattern(self, pattern: str) -> int:
+        """Delete matching Redis keys with incremental SCAN, a batch at a time"""
+        deleted = 0
+        batch = []
+        try:
+            async for key in self.redis.scan_iter(match=pattern, count=settings.cache_scan_batch):
+                batch.append(key)
+                if len(batch) >= settings.cache_scan_batch:
+                    deleted += await self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await self.redis.unlink(*batch)
+            logger.info(f"Cache sweep of {pattern} deleted {deleted} keys")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache sweep error for {pattern}: {e}")
+        return deleted
+
+    async def clear_pattern(self, pattern: str) -> int:
+        """
+        Clear all keys matching a glob-style pattern. Local entries go at
+        once; Redis keys are removed by a background SCAN sweep, so this
+        never blocks Redis the way KEYS does. Returns the number of local
+        entries cleared. Prefer invalidate() for anything on a hot path.
+        """
+        try:
+            cleared = self._clear_local_pattern(pattern)
+            if self.enabled:
+                await self._publish_invalidation(pattern=pattern)
+                sweep = asyncio.create_task(self._sweep_pattern(pattern))
+                self._sweeps.add(sweep)
+                sweep.add_done_callback(self._sweeps.discard)
+            return cleared
         except Exception as e:
             logger.error(f"Cache clear pattern error for {pattern}: {e}")
             return 0
 
+    def stats(self) -> dict:
+        """Cache backend and in-memory counters"""
+        return {
+            "backend": "redis" if self.enabled else "memory",
+            "memory": self.memory.stats()
+        }
+
+    async def acquire_lock(self, name: str, ttl_seconds: int) -> Optional[str]:
+        """Acquire a short-lived cross-process lock, returns a release token or None if held"""
+        token = uuid.uuid4().hex
+        try:
+            if self.enabled:
+                acquired = await self.redis.set(f"lock:{name}", token, nx=True, ex=ttl_seconds)
+                return token if acquired else None
+            # single process - in-process coalescing already serializes callers
+            return token
+        except Exception as e:
+            logger.error(f"Cache lock error for {name}: {e}")
+            # fail open so a Redis hiccup doesn't block fetches
+            return token
+
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock only if it is still held with the given token"""
+        try:
+            if self.enabled:
+                return bool(await self.redis.eval(_RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token))
+            return True
+        except Exception as e:
+            logger.error(f"Cache unlock error for {name}: {e}")
+            return False
+
+    async def is_locked(self, name: str) -> bool:
+        """Check whether a lock is currently held by any process"""
+        try:
+            if self.enabled:
+                return bool(await self.redis.exists(f"lock:{name}"))
+            return False
+        except Exception as e:
+            logger.error(f"Cache lock check error for {name}: {e}")
+            return False
+
+def _local_size(value: Any, encoded: bytes) -> int:
+    """L1 size of a decoded value; compressed frames are much larger in memory"""
+    inner = value.value if isinstance(value, CacheEnvelope) else value
+    return estimate_size(inner) if isinstance(inner, pd.DataFrame) else len(encoded)
+
+# compare-and-delete so an expired lock re-acquired elsewhere isn't released
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# INCR a generation; a missing counter (never bumped, flushed or evicted) first
+# restarts from the Redis clock in milliseconds, so it lands above any value a
+# worker may still hold and a bump is never mistaken for an old generation
+_BUMP_GENERATION_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    local t = redis.call('time')
+    redis.call('set', KEYS[1], string.format('%.0f', tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)))
+end
+return redis.call('incr', KEYS[1])
+"""
+
 # global cache instance
-cache_service = CacheService()
\ No newline at end of file
+cache_service = CacheService()
@@ -0,0 +1,122 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+import logging
+
+from ..core.config import settings
+from ..core.exceptions import RateLimitExceededError
+from ..models.schemas import Season
+from ..utils.token_bucket import background_priority
+from .cache_service import cache_service
+from .nba_service import nba_service, CAREER_TTL_MINUTES, SHOT_CHART_TTL_MINUTES, TEAM_STATS_TTL_MINUTES
+
+logger = logging.getLogger(__name__)
+
+class WarmTarget(NamedTuple):
+    cache_key: str
+    ttl_minutes: int
+    refresh: Callable[[], Awaitable]
+
+class CacheWarmer:
+    """
+    Refresh-ahead scheduler run as a background task from the lifespan.
+
+    Every interval it builds the hot set (team stats for each Season, plus
+    the most requested careers and shot charts) and reloads any entry past
+    ~80% of its TTL from upstream (not the warehouse, which may be hours
+    old), with per-key jitter so refreshes don't line up. Each refresh
+    takes a Redis lock (warm:{key}) so only one worker does it, and runs at
+    background priority on the upstream token bucket. Request counts decay
+    with a half-life, so "most requested" follows current demand.
+    """
+
+    def __init__(self):
+        self._jitter: Dict[str, float] = {}
+        self.refreshed = 0
+        self.failed = 0
+
+    def _hot_set(self) -> List[WarmTarget]:
+        targets = [
+            WarmTarget(
+                f"team_stats:{season.value}",
+                TEAM_STATS_TTL_MINUTES,
+                lambda season=season.value: nba_service.get_team_stats(season, refresh=True)
+            )
+            for season in Season
+        ]
+
+        for key, _ in nba_service.request_counts.most_common(settings.warmer_top_keys):
+            if key[0] == "career":
+                targets.append(WarmTarget(
+                    f"player_career:{key[1]}",
+                    CAREER_TTL_MINUTES,
+                    lambda player_id=key[1]: nba_service.get_player_career_stats(player_id, refresh=True)
+                ))
+            elif key[0] == "shot_chart":
+                targets.append(WarmTarget(
+                    f"shot_chart:{key[1]}:{key[2]}",
+                    SHOT_CHART_TTL_MINUTES,
+                    lambda player_id=key[1], season=key[2]: nba_service.get_shot_chart_data(player_id, season, refresh=True)
+                ))
+        return targets
+
+    def _refresh_at(self, target: WarmTarget) -> float:
+        """Remaining time to soft expiry (seconds) at which the entry is due, jittered per key"""
+        ttl_seconds = target.ttl_minutes * 60
+        jitter = self._jitter.get(target.cache_key)
+        if jitter is None:
+            jitter = self._jitter[target.cache_key] = random.uniform(-1, 1) * settings.warmer_jitter_fraction
+        return ttl_seconds * (1 - settings.warmer_refresh_fraction + jitter)
+
+    async def _refresh(self, target: WarmTarget) -> bool:
+        """Reload one entry unless another worker is already doing it"""
+        lock_name = f"warm:{target.cache_key}"
+        token = await cache_service.acquire_lock(lock_name, settings.single_flight_lock_seconds)
+        if token is None:
+            return False
+        try:
+            await target.refresh()
+            self.refreshed += 1
+            return True
+        finally:
+            await cache_service.release_lock(lock_name, token)
+
+    async def run_once(self) -> int:
+        """Refresh every hot entry that is missing or due; returns the number refreshed"""
+        refreshed = 0
+        hot_set = self._hot_set()
+        # jitter is only kept for keys still being warmed
+        hot_keys = {target.cache_key for target in hot_set}
+        self._jitter = {key: jitter for key, jitter in self._jitter.items() if key in hot_keys}
+        for target in hot_set:
+            remaining = await nba_service.soft_ttl_remaining(target.cache_key, target.ttl_minutes)
+            if remaining is not None and remaining > self._refresh_at(target):
+                continue
+            try:
+                refreshed += await self._refresh(target)
+            except RateLimitExceededError:
+                # live traffic is using the quota; try again next round
+                logger.info("Cache warmer paused: upstream quota busy")
+                break
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Cache warmer failed to refresh {target.cache_key}: {e}")
+        return refreshed
+
+    async def run_forever(self):
+        """Background loop, started and cancelled by the app lifespan"""
+        # upstream calls made from this task yield to live requests
+        background_priority.set(True)
+        while True:
+            try:
+                refreshed = await self.run_once()
+                if refreshed:
+                    logger.info(f"Cache warmer refreshed {refreshed} entries")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache warmer error: {e}")
+            await asyncio.sleep(settings.warmer_interval_seconds)
+
+# global cache warmer instance
+cache_warmer = CacheWarmer()
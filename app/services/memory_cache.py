@@ -0,0 +1,213 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import pandas as pd
+import logging
+
+from ..utils.codecs import CacheEnvelope, RenderedResponse
+
+logger = logging.getLogger(__name__)
+
+def namespace_of(key: str) -> str:
+    """Namespace of a cache key ("shot_chart:201939:2023-24" -> "shot_chart")"""
+    return key.split(':', 1)[0]
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory cost of a cached value (JSON size, or frame memory usage)"""
+    if isinstance(value, CacheEnvelope):
+        value = value.value
+    if isinstance(value, RenderedResponse):
+        return len(value.body) + 256
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+class MemoryCache:
+    """
+    Bounded in-process cache with TTL and LRU eviction.
+
+    Entries live in one LRU list per namespace so a namespace limit only
+    evicts its own keys; the global byte/entry caps evict the least recently
+    used entry across all namespaces. Expired entries are removed on read
+    and by a periodic sweep.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, namespace_limits: Optional[Dict[str, int]] = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.namespace_limits = namespace_limits or {}
+
+        self._namespaces: Dict[str, "OrderedDict[str, _Entry]"] = {}
+        self._namespace_bytes: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._bytes = 0
+        self._count = 0
+        self._lock = threading.RLock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count_event(self, namespace: str, event: str, amount: int = 1):
+        counters = self._counters.setdefault(
+            namespace,
+            {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0, "rejected": 0}
+        )
+        counters[event] += amount
+
+    def _remove(self, namespace: str, key: str) -> Optional[_Entry]:
+        """Drop an entry and its LRU timestamp; every removal path goes through here"""
+        self._last_used.pop(key, None)
+        entries = self._namespaces.get(namespace)
+        entry = entries.pop(key, None) if entries is not None else None
+        if entry is not None:
+            self._bytes -= entry.size
+            self._count -= 1
+            self._namespace_bytes[namespace] -= entry.size
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live value and mark it most recently used"""
+        namespace = namespace_of(key)
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                self._count_event(namespace, "misses")
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(namespace, key)
+                self._count_event(namespace, "expirations")
+                self._count_event(namespace, "misses")
+                return None
+
+            entries.move_to_end(key)
+            self._last_used[key] = time.monotonic()
+            self._count_event(namespace, "hits")
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl_seconds: float, size: Optional[int] = None) -> bool:
+        """Store a value, evicting least recently used entries to stay within limits"""
+        namespace = namespace_of(key)
+        size = size if size is not None else estimate_size(value)
+        namespace_limit = self.namespace_limits.get(namespace, self.max_bytes)
+
+        with self._lock:
+            self._remove(namespace, key)
+            if size > namespace_limit or size > self.max_bytes:
+                self._count_event(namespace, "rejected")
+                return False
+
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            self._namespace_bytes.setdefault(namespace, 0)
+            entries[key] = _Entry(value, time.monotonic() + ttl_seconds, size)
+            self._last_used[key] = time.monotonic()
+            self._bytes += size
+            self._count += 1
+            self._namespace_bytes[namespace] += size
+            self._count_event(namespace, "sets")
+
+            # namespace limit first, then global limits
+            while self._namespace_bytes[namespace] > namespace_limit:
+                self._evict_from(namespace)
+            while self._bytes > self.max_bytes or self._count > self.max_entries:
+                self._evict_global()
+            return True
+
+    def _evict_from(self, namespace: str):
+        key = next(iter(self._namespaces[namespace]))
+        self._remove(namespace, key)
+        self._count_event(namespace, "evictions")
+
+    def _evict_global(self):
+        # the global LRU entry is the oldest head of the per-namespace lists
+        oldest_namespace = min(
+            (ns for ns, entries in self._namespaces.items() if entries),
+            key=lambda ns: self._last_used[next(iter(self._namespaces[ns]))]
+        )
+        self._evict_from(oldest_namespace)
+
+    def delete(self, key: str) -> bool:
+        """Delete a key, returns whether it existed"""
+        with self._lock:
+            return self._remove(namespace_of(key), key) is not None
+
+    def ttl(self, key: str) -> Optional[float]:
+        """Seconds until a live entry expires, None if missing or expired (does not touch LRU order)"""
+        with self._lock:
+            entries = self._namespaces.get(namespace_of(key))
+            entry = entries.get(key) if entries is not None else None
+            if entry is None:
+                return None
+            remaining = entry.expires_at - time.monotonic()
+            return remaining if remaining > 0 else None
+
+    def keys(self) -> List[str]:
+        """Snapshot of all stored keys (including not yet swept expired ones)"""
+        with self._lock:
+            return [key for entries in self._namespaces.values() for key in entries]
+
+    def clear(self):
+        """Drop every entry (hit/miss counters are kept)"""
+        with self._lock:
+            self._namespaces.clear()
+            self._namespace_bytes.clear()
+            self._last_used.clear()
+            self._bytes = 0
+            self._count = 0
+
+    def sweep(self) -> int:
+        """Remove all expired entries, returns the number removed"""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for namespace, entries in self._namespaces.items():
+                expired = [key for key, entry in entries.items() if entry.expires_at <= now]
+                for key in expired:
+                    self._remove(namespace, key)
+                if expired:
+                    self._count_event(namespace, "expirations", len(expired))
+                    removed += len(expired)
+        return removed
+
+    async def sweep_forever(self, interval_seconds: float):
+        """Background expiry sweeper, run as an asyncio task"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                removed = self.sweep()
+                if removed:
+                    logger.debug(f"Memory cache sweep removed {removed} expired entries")
+            except Exception as e:
+                logger.error(f"Memory cache sweep error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters, overall and per namespace"""
+        with self._lock:
+            return {
+                "entries": self._count,
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "namespaces": {
+                    namespace: {
+                        "entries": len(self._namespaces.get(namespace, ())),
+                        "bytes": self._namespace_bytes.get(namespace, 0),
+                        "limit_bytes": self.namespace_limits.get(namespace),
+                        **counters
+                    }
+                    for namespace, counters in self._counters.items()
+                }
+            }
@@ -0,0 +1,171 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+from nba_api.stats.static import players, teams
+import logging
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# match tiers, best first
+EXACT, PREFIX, TOKEN_PREFIX, FUZZY = range(4)
+
+def normalize_name(value: str) -> str:
+    """Lowercase, strip accents and punctuation ("Nikola Jokić" -> "nikola jokic")"""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    ascii_value = ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    ascii_value = re.sub(r"[.'’]", '', ascii_value)
+    return re.sub(r'[^a-z0-9]+', ' ', ascii_value).strip()
+
+def trigrams(value: str) -> set:
+    """Padded character trigrams of a normalized name"""
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    """
+    In-memory name resolver built once from the nba_api static lists.
+
+    Holds an id map, an exact normalized-name map, a sorted term array for
+    prefix lookups (bisect) and a trigram index for typo-tolerant matches.
+    resolve() is just the top search() hit, so every endpoint resolves a
+    name the same way.
+    """
+
+    def __init__(self, loader: Callable[[], List[dict]], name_fields: List[str], rank: Callable[[dict], tuple]):
+        self._loader = loader
+        self._name_fields = name_fields
+        self._rank = rank
+        self._built = False
+
+    def build(self) -> int:
+        """Build all lookup structures; returns the number of indexed entries"""
+        entries = self._loader()
+        by_id: Dict[int, dict] = {}
+        exact: Dict[str, List[int]] = defaultdict(list)
+        terms: List[Tuple[str, int]] = []
+        grams: Dict[str, List[int]] = defaultdict(list)
+        fuzzy_terms: List[Tuple[int, int]] = []
+
+        for entry in entries:
+            entry_id = entry['id']
+            by_id[entry_id] = entry
+
+            names = {normalize_name(str(entry.get(field) or '')) for field in self._name_fields}
+            names.discard('')
+
+            entry_terms = set()
+            for name in names:
+                exact[name].append(entry_id)
+                entry_terms.add(name)
+                # every later word of a name is also a prefix term ("james" for "lebron james")
+                tokens = name.split(' ')
+                for i in range(1, len(tokens)):
+                    entry_terms.add(' '.join(tokens[i:]))
+                entry_terms.update(tokens)
+
+            for term in entry_terms:
+                terms.append((term, entry_id))
+                # fuzzy matching is scored per term so "clipers" finds "clippers"
+                term_grams = trigrams(term)
+                for gram in term_grams:
+                    grams[gram].append(len(fuzzy_terms))
+                fuzzy_terms.append((entry_id, len(term_grams)))
+
+        terms.sort()
+        self._by_id = by_id
+        self._exact = dict(exact)
+        self._terms = [t for t, _ in terms]
+        self._term_ids = [i for _, i in terms]
+        self._full_terms = {(normalize_name(e['full_name']), e['id']) for e in entries}
+        self._grams = dict(grams)
+        self._fuzzy_terms = fuzzy_terms
+        self._built = True
+
+        logger.info(f"Name index built with {len(by_id)} entries and {len(terms)} prefix terms")
+        return len(by_id)
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def get(self, entry_id: int) -> Optional[dict]:
+        """Look up an entry by id"""
+        self._ensure_built()
+        return self._by_id.get(entry_id)
+
+    def _prefix_matches(self, query: str) -> Dict[int, int]:
+        """Map entry id to its best prefix tier for the query"""
+        lo = bisect_left(self._terms, query)
+        hi = bisect_left(self._terms, query + '\uffff', lo)
+
+        matches: Dict[int, int] = {}
+        for pos in range(lo, hi):
+            entry_id = self._term_ids[pos]
+            tier = PREFIX if (self._terms[pos], entry_id) in self._full_terms else TOKEN_PREFIX
+            if tier < matches.get(entry_id, FUZZY):
+                matches[entry_id] = tier
+        return matches
+
+    def _fuzzy_matches(self, query: str) -> Dict[int, float]:
+        """Map entry id to its trigram (Dice) similarity, above the configured minimum"""
+        query_grams = trigrams(query)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for term_pos in self._grams.get(gram, ()):
+                shared[term_pos] += 1
+
+        scores: Dict[int, float] = {}
+        for term_pos, count in shared.items():
+            entry_id, gram_count = self._fuzzy_terms[term_pos]
+            score = 2 * count / (len(query_grams) + gram_count)
+            if score >= settings.name_match_min_score and score > scores.get(entry_id, 0.0):
+                scores[entry_id] = score
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> Tuple[List[dict], int]:
+        """
+        Ranked matches (exact, prefix, word prefix, fuzzy) and the total
+        number found. Fuzzy matches always rank below the others, so they
+        are only scored when those leave fewer than limit results.
+        """
+        self._ensure_built()
+        normalized = normalize_name(query)
+        if not normalized:
+            return [], 0
+
+        # tier, negative similarity, entry rank
+        ranked: Dict[int, tuple] = {}
+        for entry_id in self._exact.get(normalized, ()):
+            ranked[entry_id] = (EXACT, 0.0)
+        for entry_id, tier in self._prefix_matches(normalized).items():
+            if entry_id not in ranked:
+                ranked[entry_id] = (tier, 0.0)
+        if len(normalized) >= 3 and len(ranked) < limit:
+            for entry_id, score in self._fuzzy_matches(normalized).items():
+                if entry_id not in ranked:
+                    ranked[entry_id] = (FUZZY, -score)
+
+        ordered = sorted(ranked, key=lambda i: ranked[i] + self._rank(self._by_id[i]))
+        return [self._by_id[i] for i in ordered[:limit]], len(ordered)
+
+    def resolve(self, name: str) -> Optional[dict]:
+        """Best match for a name, or None"""
+        results, _ = self.search(name, limit=1)
+        return results[0] if results else None
+
+# active players win ties, then shorter names
+player_index = NameIndex(
+    players.get_players,
+    ['full_name'],
+    lambda p: (not p.get('is_active', False), len(p['full_name']), p['full_name'])
+)
+
+team_index = NameIndex(
+    teams.get_teams,
+    ['full_name', 'abbreviation', 'nickname', 'city'],
+    lambda t: (len(t['full_name']), t['full_name'])
+)
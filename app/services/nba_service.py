@@ -2,183 +2,511 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
 import pandas as pd
-from nba_api.stats.static import players, teams
 from nba_api.stats.endpoints import (
     playercareerstats, 
     teamestimatedmetrics,
     leaguedashteamstats,
+    leaguedashplayerstats,
+    leaguegamelog,
     shotchartdetail,
     playerprofilev2
 )
-import time
+import functools
 import logging
+import math
+import time
+from collections import Counter
 
-from ..core.exceptions import PlayerNotFoundError, TeamNotFoundError, NBAAPIError
+from ..core.exceptions import PlayerNotFoundError, TeamNotFoundError, NBAAPIError, RateLimitExceededError, UpstreamReplayMissError
 from ..core.config import settings
-from ..utils.helpers import calculate_advanced_stats, detect_career_milestones, safe_float_conversion, safe_int_conversion
+from ..core.middleware import mark_stale
+from ..core.metrics import RATE_LIMIT_WAIT, UPSTREAM_LATENCY, UPSTREAM_RETRIES, track_executor, record_rows
+from ..utils.token_bucket import upstream_limiter, background_priority, is_background
+from ..utils.codecs import CacheEnvelope
+from ..utils.http_cache import get_version, record_source, record_version, tracking_sources
+from ..utils.helpers import calculate_advanced_stats, detect_career_milestones, safe_float_conversion, safe_int_conversion, frame_to_records
+from ..utils.shot_bins import hexbin_shots, zone_shots
 from .cache_service import cache_service
+from .warehouse_service import StoredFrame, warehouse_service
+from .single_flight import single_flight
+from .name_index import player_index, team_index
+from .upstream import upstream_adapter
 
 logger = logging.getLogger(__name__)
 
+# cache lifetimes (soft expiry), also used by the cache warmer to schedule refreshes
+CAREER_TTL_MINUTES = 60
+SHOT_CHART_TTL_MINUTES = 24 * 60
+TEAM_STATS_TTL_MINUTES = 30
+LEAGUE_STATS_TTL_MINUTES = 30
+
+def entry_lifetimes(ttl_minutes: int):
+    """Soft expiry, hard expiry and cache retention in minutes for a data TTL"""
+    hard_minutes = int(ttl_minutes * settings.swr_hard_ttl_factor)
+    return ttl_minutes, hard_minutes, hard_minutes + settings.stale_if_error_minutes
+
 class NBAService:
     def __init__(self):
         self.executor = ThreadPoolExecutor(max_workers=4)
-        self._api_call_times = []
+        # recent live requests per hot key, used by the cache warmer to pick what it keeps warm
+        self.request_counts: Counter = Counter()
+        self._counts_decayed_at = time.monotonic()
+        # background revalidations, kept referenced until they finish
+        self._revalidations: set = set()
     
-    def _enforce_rate_limit(self):
-        """Enforce rate limiting for NBA API calls"""
-        current_time = time.time()
-        # remove calls older than 1 minute
-        self._api_call_times = [t for t in self._api_call_times if current_time - t < 60]
-        
-        # If not at the limit, wait
-        if len(self._api_call_times) >= settings.rate_limit_calls:
-            sleep_time = 60 - (current_time - self._api_call_times[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        self._api_call_times.append(current_time)
+    def decay_request_counts(self, factor: float, max_keys: int):
+        """Scale request counts by factor, dropping keys that faded below half a request and all but the top max_keys"""
+        counts = Counter({key: count * factor for key, count in self.request_counts.items() if count * factor >= 0.5})
+        if len(counts) > max_keys:
+            counts = Counter(dict(counts.most_common(max_keys)))
+        self.request_counts = counts
+    
+    def _count_request(self, key: tuple):
+        """Count a live request, aging the counts at most once a minute or when too many keys pile up"""
+        self.request_counts[key] += 1
+        now = time.monotonic()
+        elapsed = now - self._counts_decayed_at
+        if elapsed >= 60 or len(self.request_counts) > 2 * settings.warmer_max_tracked_keys:
+            self._counts_decayed_at = now
+            self.decay_request_counts(0.5 ** (elapsed / settings.warmer_count_half_life_seconds), settings.warmer_max_tracked_keys)
     
     async def _safe_api_call(self, api_func, *args, **kwargs):
         """Safely call NBA API with retries and error handling"""
         loop = asyncio.get_event_loop()
+        endpoint = getattr(api_func, '__name__', 'unknown')
         
         for attempt in range(settings.max_retries):
             try:
-                # Run API call in thread pool to avoid blocking
-                result = await loop.run_in_executor(
-                    self.executor,
-                    lambda: self._execute_api_call(api_func, *args, **kwargs)
-                )
+                # wait for quota on the loop, not in an executor thread
+                # (a shared load is raised to live once a live caller joins it)
+                priority = "background" if is_background() else "live"
+                waited = await upstream_limiter.acquire()
+                RATE_LIMIT_WAIT.labels(priority).observe(waited)
+                
+                # Run API call in thread pool to avoid blocking (live, recorded or replayed)
+                start = time.perf_counter()
+                try:
+                    result = await loop.run_in_executor(
+                        self.executor,
+                        track_executor("nba_api", lambda: upstream_adapter.call(api_func, *args, **kwargs))
+                    )
+                except Exception:
+                    UPSTREAM_LATENCY.labels(endpoint, "error").observe(time.perf_counter() - start)
+                    raise
+                UPSTREAM_LATENCY.labels(endpoint, "ok").observe(time.perf_counter() - start)
                 return result
+            except (RateLimitExceededError, UpstreamReplayMissError):
+                raise
             except Exception as e:
-                logger.warning(f"API call failed (attempt {attempt + 1}/{settings.max_retries}): {str(e)}")
+                logger.warning(f"API call to {endpoint} failed (attempt {attempt + 1}/{settings.max_retries}): {str(e)}")
                 if attempt == settings.max_retries - 1:
                     raise NBAAPIError(f"NBA API unavailable after {settings.max_retries} attempts: {str(e)}")
                 
                 # exponential backoff
+                UPSTREAM_RETRIES.labels(endpoint).inc()
                 await asyncio.sleep(2 ** attempt)
     
-    def _execute_api_call(self, api_func, *args, **kwargs):
-        """Execute NBA API call with rate limiting"""
-        self._enforce_rate_limit()
-        return api_func(*args, **kwargs)
+    async def _run_blocking(self, func, *args):
+        """Run blocking (database) work on the default executor, away from the API workers"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, track_executor("default", functools.partial(func, *args)))
     
     async def get_player_id(self, name: str) -> Optional[int]:
-        """Get player ID by name with caching"""
-        cache_key = f"player_id:{name.lower()}"
-        cached_id = cache_service.get(cache_key)
-        
-        if cached_id is not None:
-            return cached_id
-        
+        """Get player ID by name from the in-process name index"""
         try:
-            # static call to cache it for longer
-            player_list = players.get_players()
-            match = next((p for p in player_list if name.lower() in p['full_name'].lower()), None)
-            player_id = match['id'] if match else None
-            
-            # cache for 24 hours
-            cache_service.set(cache_key, player_id, ttl_minutes=24 * 60)
-            return player_id
+            match = player_index.resolve(name)
+            return match['id'] if match else None
             
         except Exception as e:
             logger.error(f"Error getting player ID for {name}: {e}")
             return None
     
     async def get_team_id(self, name: str) -> Optional[int]:
-        """Get team ID by name with caching"""
-        cache_key = f"team_id:{name.lower()}"
-        cached_id = cache_service.get(cache_key)
-        
-        if cached_id is not None:
-            return cached_id
-        
+        """Get team ID by name or abbreviation from the in-process name index"""
         try:
-            team_list = teams.get_teams()
-            match = next((t for t in team_list if name.lower() in t['full_name'].lower() or name.lower() in t['abbreviation'].lower()), None)
-            team_id = match['id'] if match else None
-            
-            # cache for 24 hours
-            cache_service.set(cache_key, team_id, ttl_minutes=24 * 60)
-            return team_id
+            match = team_index.resolve(name)
+            return match['id'] if match else None
             
         except Exception as e:
             logger.error(f"Error getting team ID for {name}: {e}")
             return None
     
-    async def get_player_career_stats(self, player_id: int) -> pd.DataFrame:
-        """Get player career statistics"""
-        cache_key = f"player_career:{player_id}"
-        cached_data = cache_service.get(cache_key)
+    async def _get_cached_entry(self, cache_key: str) -> Optional[CacheEnvelope]:
+        """Get a cached frame with its expiry, or None on a miss"""
+        cached_data = await cache_service.get(cache_key)
+        if cached_data is None or isinstance(cached_data, CacheEnvelope):
+            return cached_data
+        # entries written before expiry envelopes count as fresh until their TTL ends
+        if not isinstance(cached_data, pd.DataFrame):
+            # entries written as records before the columnar codec
+            cached_data = pd.DataFrame(cached_data)
+        return CacheEnvelope(cached_data, float('inf'), float('inf'))
+    
+    async def _get_cached_frame(self, cache_key: str) -> Optional[pd.DataFrame]:
+        """Get a cached DataFrame that is still fresh, or None"""
+        entry = await self._get_cached_entry(cache_key)
+        if entry is None or time.time() >= entry.soft_expires_at:
+            return None
+        return entry.value
+    
+    async def _cache_frame(self, cache_key: str, df: pd.DataFrame, ttl_minutes: int, fetched_at: Optional[float] = None):
+        """
+        Cache a frame with soft/hard expiry, retained past hard expiry for
+        serve-stale-on-error. Expiry counts from fetched_at (default now),
+        so frames from the warehouse keep their age.
+        """
+        soft_minutes, hard_minutes, retention_minutes = entry_lifetimes(ttl_minutes)
+        now = time.time()
+        fetched_at = now if fetched_at is None else fetched_at
+        envelope = CacheEnvelope(df, fetched_at + soft_minutes * 60, fetched_at + hard_minutes * 60)
+        remaining_minutes = max(1, math.ceil(retention_minutes - (now - fetched_at) / 60))
+        await cache_service.set(cache_key, envelope, ttl_minutes=remaining_minutes)
+        # content version behind ETags of responses built from this frame
+        if await record_version(cache_key, df, retention_minutes):
+            # entries derived from the old content (scoped_key on this key) are no longer read
+            await cache_service.invalidate(cache_key)
+    
+    async def _cache_stored_frame(self, cache_key: str, stored: Optional[StoredFrame], ttl_minutes: int) -> Optional[pd.DataFrame]:
+        """
+        Cache a warehouse frame by the time it was fetched upstream. Frames
+        past soft expiry are served as stale (and revalidated by the next
+        request); frames past hard expiry are skipped so the caller goes
+        upstream, keeping them only as a fallback (see _stored_fallback).
+        """
+        if stored is None or stored.df.empty:
+            return None
+        now = time.time()
+        fetched_at = now if stored.fetched_at is None else stored.fetched_at
+        soft_minutes, hard_minutes, _ = entry_lifetimes(ttl_minutes)
+        if now >= fetched_at + hard_minutes * 60:
+            return None
+        await self._cache_frame(cache_key, stored.df, ttl_minutes, fetched_at)
+        if now >= fetched_at + soft_minutes * 60:
+            mark_stale(now - fetched_at - soft_minutes * 60)
+        return stored.df
+    
+    def _stored_fallback(self, cache_key: str, stored: Optional[StoredFrame], ttl_minutes: int, error: Exception) -> pd.DataFrame:
+        """Serve a warehouse frame too old to cache when the upstream load failed, else re-raise"""
+        if stored is None or stored.df.empty or not settings.serve_stale_on_error:
+            raise error
+        logger.warning(f"Serving warehouse copy of {cache_key} after failed reload: {error}")
+        soft_minutes, _, _ = entry_lifetimes(ttl_minutes)
+        mark_stale(time.time() - stored.fetched_at - soft_minutes * 60, revalidation_failed=True)
+        return stored.df
+    
+    async def soft_ttl_remaining(self, cache_key: str, ttl_minutes: int) -> Optional[float]:
+        """Seconds until a cached frame goes stale (negative once stale), None if not cached"""
+        remaining = await cache_service.ttl(cache_key)
+        if remaining is None:
+            return None
+        soft_minutes, _, retention_minutes = entry_lifetimes(ttl_minutes)
+        return remaining - (retention_minutes - soft_minutes) * 60
+    
+    def _revalidate(self, cache_key: str, loader):
+        """
+        Start one background reload of a stale key. It goes upstream past
+        the warehouse, whose copy may be older than the stale entry; if that
+        fails the stale entry keeps being served until hard expiry.
+        """
+        if single_flight.is_running(cache_key):
+            return
+        
+        async def reload():
+            # the stale value was already served, so yield quota to live requests
+            background_priority.set(True)
+            try:
+                await single_flight.do(cache_key, lambda: loader(True), lambda: self._get_cached_frame(cache_key))
+            except Exception as e:
+                logger.warning(f"Background revalidation of {cache_key} failed: {e}")
+        
+        task = asyncio.create_task(reload())
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+    
+    async def _get_frame(self, cache_key: str, loader, refresh: bool = False) -> pd.DataFrame:
+        """
+        Serve a frame from cache, coalescing concurrent misses into one load.
+        Between soft and hard expiry the stale frame is returned and reloaded
+        in the background; past hard expiry a failed load still falls back to
+        the stale frame. loader(refresh) loads the frame, and with refresh
+        set it skips the cache and warehouse. Stale responses are flagged for
+        the staleness header, and the frame's rows count towards the
+        request's rows-processed metric.
+        Routes with ETags get the frame's content version, read before the
+        frame so a concurrent refresh can only make the ETag older than the
+        body (one extra 200), never newer (a wrong 304).
+        """
+        version = await get_version(cache_key) if tracking_sources() else None
+        df = await self._serve_frame(cache_key, loader, refresh)
+        record_rows(len(df))
+        record_source(cache_key, version)
+        return df
+    
+    async def _serve_frame(self, cache_key: str, loader, refresh: bool) -> pd.DataFrame:
+        """Fresh, stale or freshly loaded frame for _get_frame"""
+        entry = None if refresh else await self._get_cached_entry(cache_key)
+        now = time.time()
         
-        if cached_data is not None:
-            return pd.DataFrame(cached_data)
+        if entry is not None:
+            if now < entry.soft_expires_at:
+                return entry.value
+            if now < entry.hard_expires_at:
+                self._revalidate(cache_key, loader)
+                mark_stale(now - entry.soft_expires_at)
+                return entry.value
+        
+        try:
+            return await single_flight.do(
+                cache_key,
+                lambda: loader(refresh),
+                lambda: self._get_cached_frame(cache_key)
+            )
+        except Exception as e:
+            if entry is None or not settings.serve_stale_on_error:
+                raise
+            logger.warning(f"Serving stale {cache_key} after failed reload: {e}")
+            mark_stale(now - entry.soft_expires_at, revalidation_failed=True)
+            return entry.value
+    
+    async def get_player_career_stats(self, player_id: int, refresh: bool = False) -> pd.DataFrame:
+        """Get player career statistics (refresh reloads past the cache, e.g. for the warmer)"""
+        cache_key = f"player_career:{player_id}"
+        if not refresh:
+            self._count_request(("career", player_id))
+        return await self._get_frame(
+            cache_key, lambda refresh: self._load_player_career_stats(player_id, cache_key, refresh), refresh
+        )
+    
+    async def _load_player_career_stats(self, player_id: int, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load player career statistics from the warehouse or upstream (refresh goes straight upstream)"""
+        # another worker may have filled the cache just before we took the lock
+        stored = None
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+            
+            # warm from the warehouse before going upstream
+            stored = await self._run_blocking(warehouse_service.load_player_career, player_id)
+            stored_df = await self._cache_stored_frame(cache_key, stored, CAREER_TTL_MINUTES)
+            if stored_df is not None:
+                return stored_df
         
         try:
             career_data = await self._safe_api_call(
-                lambda: playercareerstats.PlayerCareerStats(player_id=player_id)
+                playercareerstats.PlayerCareerStats, player_id=player_id
             )
             df = career_data.get_data_frames()[0]
             
             if df.empty:
                 raise NBAAPIError(f"No career data found for player ID {player_id}")
             
+            await self._run_blocking(warehouse_service.store_player_career, player_id, df)
+            
             # cache for 1 hour
-            cache_service.set(cache_key, df.to_dict('records'), ttl_minutes=60)
+            await self._cache_frame(cache_key, df, CAREER_TTL_MINUTES)
             return df
             
         except Exception as e:
             logger.error(f"Error getting career stats for player {player_id}: {e}")
-            raise
+            return self._stored_fallback(cache_key, stored, CAREER_TTL_MINUTES, e)
     
-    async def get_shot_chart_data(self, player_id: int, season: str = "2023-24") -> pd.DataFrame:
-        """Get player shot chart data"""
+    async def get_shot_chart_data(self, player_id: int, season: str = "2023-24", refresh: bool = False) -> pd.DataFrame:
+        """Get player shot chart data (refresh reloads past the cache, e.g. for the warmer)"""
         cache_key = f"shot_chart:{player_id}:{season}"
-        cached_data = cache_service.get(cache_key)
-        
-        if cached_data is not None:
-            return pd.DataFrame(cached_data)
+        if not refresh:
+            self._count_request(("shot_chart", player_id, season))
+        return await self._get_frame(
+            cache_key, lambda refresh: self._load_shot_chart_data(player_id, season, cache_key, refresh), refresh
+        )
+    
+    async def _load_shot_chart_data(self, player_id: int, season: str, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load player shot chart data from the warehouse or upstream (refresh goes straight upstream)"""
+        stored = None
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+            
+            stored = await self._run_blocking(warehouse_service.load_shot_chart, player_id, season)
+            stored_df = await self._cache_stored_frame(cache_key, stored, SHOT_CHART_TTL_MINUTES)
+            if stored_df is not None:
+                return stored_df
         
         try:
             shot_data = await self._safe_api_call(
-                lambda: shotchartdetail.ShotChartDetail(
-                    player_id=player_id,
-                    team_id=0,
-                    season_nullable=season,
-                    context_measure_simple='FGA'
-                )
+                shotchartdetail.ShotChartDetail,
+                player_id=player_id,
+                team_id=0,
+                season_nullable=season,
+                context_measure_simple='FGA'
             )
-            df = shot_data.get_data_frames()[0]
+            frames = shot_data.get_data_frames()
+            df = frames[0]
+            
+            # league averages come with every shot chart response
+            if len(frames) > 1 and not frames[1].empty:
+                await self._cache_frame(f"shot_league_avg:{season}", frames[1], SHOT_CHART_TTL_MINUTES)
+            
+            await self._run_blocking(warehouse_service.store_shot_chart, player_id, season, df)
             
             # cache for 24 hours
-            cache_service.set(cache_key, df.to_dict('records'), ttl_minutes=24 * 60)
+            await self._cache_frame(cache_key, df, SHOT_CHART_TTL_MINUTES)
             return df
             
         except Exception as e:
             logger.error(f"Error getting shot chart for player {player_id}, season {season}: {e}")
+            return self._stored_fallback(cache_key, stored, SHOT_CHART_TTL_MINUTES, e)
+    
+    async def get_shot_league_averages(self, player_id: int, season: str = "2023-24") -> pd.DataFrame:
+        """Get league shooting averages by zone, fetched alongside a player's shot chart"""
+        cache_key = f"shot_league_avg:{season}"
+        return await self._get_frame(cache_key, lambda refresh: self._load_shot_league_averages(player_id, season, cache_key, refresh))
+    
+    async def _load_shot_league_averages(self, player_id: int, season: str, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load league shooting averages from upstream"""
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+        
+        try:
+            shot_data = await self._safe_api_call(
+                shotchartdetail.ShotChartDetail,
+                player_id=player_id,
+                team_id=0,
+                season_nullable=season,
+                context_measure_simple='FGA'
+            )
+            df = shot_data.get_data_frames()[1]
+            
+            # cache for 24 hours
+            await self._cache_frame(cache_key, df, SHOT_CHART_TTL_MINUTES)
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error getting league shot averages for season {season}: {e}")
             raise
     
-    async def get_team_stats(self, season: str = "2023-24") -> pd.DataFrame:
-        """Get team statistics for a season"""
-        cache_key = f"team_stats:{season}"
-        cached_data = cache_service.get(cache_key)
+    async def get_shot_chart_bins(
+        self,
+        player_id: int,
+        season: str,
+        mode: str,
+        bin_size: float,
+        compare_league: bool
+    ) -> List[Dict[str, Any]]:
+        """Get binned shot chart aggregates (hexbin or zones), cached per player/season/bin size"""
+        # every bin size and mode is dropped at once when the shot chart (or league averages) change
+        sources = [f"shot_chart:{player_id}:{season}"] + ([f"shot_league_avg:{season}"] if compare_league else [])
+        cache_key = await cache_service.scoped_key(
+            f"shot_bins:{player_id}:{season}:{mode}:{bin_size:g}:{int(compare_league)}", *sources
+        )
+        # the bins stand in for their sources, so ETags cover them on hits too (versions read first, as in _get_frame)
+        for source in sources:
+            record_source(source, await get_version(source) if tracking_sources() else None)
+        cached_bins = await cache_service.get(cache_key)
+        if cached_bins is not None:
+            return cached_bins
         
-        if cached_data is not None:
-            return pd.DataFrame(cached_data)
+        shot_df = await self.get_shot_chart_data(player_id, season)
+        league_df = await self.get_shot_league_averages(player_id, season) if compare_league else None
+        
+        if shot_df.empty:
+            bins = []
+        elif mode == "hexbin":
+            bins = frame_to_records(hexbin_shots(shot_df, bin_size, league_df))
+        else:
+            bins = frame_to_records(zone_shots(shot_df, league_df))
+        
+        # same lifetime as the shot chart it was built from
+        await cache_service.set(cache_key, bins, ttl_minutes=SHOT_CHART_TTL_MINUTES)
+        return bins
+    
+    async def get_team_stats(self, season: str = "2023-24", refresh: bool = False) -> pd.DataFrame:
+        """Get team statistics for a season (refresh reloads past the cache, e.g. for the warmer)"""
+        cache_key = f"team_stats:{season}"
+        return await self._get_frame(cache_key, lambda refresh: self._load_team_stats(season, cache_key, refresh), refresh)
+    
+    async def _load_team_stats(self, season: str, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load team statistics from the warehouse or upstream (refresh goes straight upstream)"""
+        stored = None
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+            
+            stored = await self._run_blocking(warehouse_service.load_team_stats, season)
+            stored_df = await self._cache_stored_frame(cache_key, stored, TEAM_STATS_TTL_MINUTES)
+            if stored_df is not None:
+                return stored_df
         
         try:
             team_data = await self._safe_api_call(
-                lambda: leaguedashteamstats.LeagueDashTeamStats(season=season)
+                leaguedashteamstats.LeagueDashTeamStats, season=season
             )
             df = team_data.get_data_frames()[0]
             
+            await self._run_blocking(warehouse_service.store_team_stats, season, df)
+            
             # cache for 30 minutes
-            cache_service.set(cache_key, df.to_dict('records'), ttl_minutes=30)
+            await self._cache_frame(cache_key, df, TEAM_STATS_TTL_MINUTES)
             return df
             
         except Exception as e:
             logger.error(f"Error getting team stats for season {season}: {e}")
+            return self._stored_fallback(cache_key, stored, TEAM_STATS_TTL_MINUTES, e)
+
+    async def get_league_player_stats(self, season: str = "2023-24") -> pd.DataFrame:
+        """Get per-game statistics for every player in a season"""
+        cache_key = f"league_player_stats:{season}"
+        return await self._get_frame(cache_key, lambda refresh: self._load_league_player_stats(season, cache_key, refresh))
+    
+    async def _load_league_player_stats(self, season: str, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load league-wide player statistics upstream"""
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+        
+        try:
+            league_data = await self._safe_api_call(
+                leaguedashplayerstats.LeagueDashPlayerStats, season=season, per_mode_detailed="PerGame"
+            )
+            df = league_data.get_data_frames()[0]
+            
+            # cache for 30 minutes, same as team stats
+            await self._cache_frame(cache_key, df, LEAGUE_STATS_TTL_MINUTES)
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error getting league player stats for season {season}: {e}")
+            raise
+
+    async def get_league_game_log(self, season: str = "2023-24") -> pd.DataFrame:
+        """Get every player's game log for a season"""
+        cache_key = f"league_game_log:{season}"
+        return await self._get_frame(cache_key, lambda refresh: self._load_league_game_log(season, cache_key, refresh))
+    
+    async def _load_league_game_log(self, season: str, cache_key: str, refresh: bool = False) -> pd.DataFrame:
+        """Load the league-wide player game log upstream"""
+        if not refresh:
+            cached_df = await self._get_cached_frame(cache_key)
+            if cached_df is not None:
+                return cached_df
+        
+        try:
+            log_data = await self._safe_api_call(
+                leaguegamelog.LeagueGameLog, season=season, player_or_team_abbreviation="P"
+            )
+            df = log_data.get_data_frames()[0]
+            
+            # cache for 30 minutes, new games land through the day
+            await self._cache_frame(cache_key, df, LEAGUE_STATS_TTL_MINUTES)
+            return df
+            
+        except Exception as e:
+            logger.error(f"Error getting league game log for season {season}: {e}")
             raise
 
 # global service instance
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+import logging
+
+from ..core.config import settings
+from ..utils.helpers import calculate_advanced_stats
+from ..utils.http_cache import get_version
+from .nba_service import nba_service
+
+logger = logging.getLogger(__name__)
+
+# stats with a league percentile; per-game values from LeagueDashPlayerStats
+PERCENTILE_STATS = [
+    'PTS', 'AST', 'REB', 'OREB', 'DREB', 'STL', 'BLK', 'TOV', 'PF', 'MIN',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'PLUS_MINUS', 'TS_PCT', 'PER'
+]
+
+# a high value is bad, so the percentile is flipped
+LOWER_IS_BETTER = {'TOV', 'PF'}
+
+# past this share of changed players a full rebuild is cheaper than patching
+FULL_REBUILD_FRACTION = 0.25
+
+class PercentileTable:
+    """
+    League percentiles for one season: a sorted array of qualified players'
+    values per stat, so a percentile is a single searchsorted. refresh()
+    diffs the new frame against the current one by PLAYER_ID and only
+    removes/inserts the values of players whose rows changed.
+    """
+
+    def __init__(self, season: str):
+        self.season = season
+        self.source: Optional[pd.DataFrame] = None
+        # content version (ETag) of the league frame last diffed in
+        self.version: Optional[str] = None
+        self.players: Optional[pd.DataFrame] = None
+        self.values: Dict[str, np.ndarray] = {}
+        self.builds = 0
+        self.patches = 0
+
+    def _prepare(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Stat columns for every player, indexed by PLAYER_ID, with a qualified flag"""
+        df = calculate_advanced_stats(df.drop_duplicates('PLAYER_ID', keep='last'))
+        frame = pd.DataFrame(index=pd.Index(df['PLAYER_ID'].astype(np.int64), name='PLAYER_ID'))
+        for stat in PERCENTILE_STATS:
+            column = df[stat] if stat in df.columns else np.nan
+            frame[stat] = pd.to_numeric(pd.Series(column, index=df.index), errors='coerce').to_numpy(dtype=float)
+
+        games = pd.to_numeric(df['GP'], errors='coerce').to_numpy() if 'GP' in df.columns else 0
+        frame['qualified'] = (frame['MIN'].to_numpy() >= settings.percentile_min_minutes) & \
+            (games >= settings.percentile_min_games)
+        return frame
+
+    def _qualified_values(self, players: pd.DataFrame, stat: str) -> np.ndarray:
+        """Sorted non-missing values of one stat among qualified players"""
+        values = players.loc[players['qualified'], stat].to_numpy(dtype=float)
+        return np.sort(values[~np.isnan(values)])
+
+    def _build(self, players: pd.DataFrame):
+        self.values = {stat: self._qualified_values(players, stat) for stat in PERCENTILE_STATS}
+        self.builds += 1
+
+    def _patch(self, removed: pd.DataFrame, added: pd.DataFrame):
+        for stat in PERCENTILE_STATS:
+            values = self.values[stat]
+
+            old = self._qualified_values(removed, stat)
+            if old.size:
+                # equal values: take consecutive slots starting at the first match
+                positions = np.searchsorted(values, old, side='left')
+                positions += np.arange(old.size) - np.searchsorted(old, old, side='left')
+                values = np.delete(values, positions)
+
+            new = self._qualified_values(added, stat)
+            if new.size:
+                values = np.insert(values, np.searchsorted(values, new), new)
+
+            self.values[stat] = values
+        self.patches += 1
+
+    def refresh(self, df: pd.DataFrame) -> int:
+        """Bring the table up to date with a season frame; returns the number of changed players"""
+        players = self._prepare(df)
+        previous = self.players
+        self.source = df
+
+        if previous is None:
+            self.players = players
+            self._build(players)
+            return len(players)
+
+        common = players.index.intersection(previous.index)
+        before = previous.loc[common]
+        after = players.loc[common]
+        # NaN == NaN counts as unchanged
+        differs = ((before != after) & ~(before.isna() & after.isna())).any(axis=1)
+        changed = common[differs.to_numpy()]
+
+        removed_ids = previous.index.difference(players.index).union(changed)
+        added_ids = players.index.difference(previous.index).union(changed)
+        changes = max(len(removed_ids), len(added_ids))
+        self.players = players
+
+        if changes == 0:
+            return 0
+        if changes > FULL_REBUILD_FRACTION * max(len(players), 1):
+            self._build(players)
+        else:
+            self._patch(previous.loc[removed_ids], players.loc[added_ids])
+        return changes
+
+    def percentile(self, stat: str, value: float) -> Optional[float]:
+        """Percent of qualified players this value is at least as good as"""
+        values = self.values.get(stat)
+        if values is None or values.size == 0 or value is None or np.isnan(value):
+            return None
+        if stat in LOWER_IS_BETTER:
+            at_least_as_good = values.size - np.searchsorted(values, value, side='left')
+        else:
+            at_least_as_good = np.searchsorted(values, value, side='right')
+        return round(float(at_least_as_good) / values.size * 100, 1)
+
+    def player_percentiles(self, player_id: int, stats: Optional[List[str]] = None) -> Optional[dict]:
+        """A player's percentiles against the qualified pool, or None if they didn't play that season"""
+        if self.players is None or player_id not in self.players.index:
+            return None
+        row = self.players.loc[player_id]
+        percentiles = {}
+        for stat in stats or PERCENTILE_STATS:
+            if stat in self.values:
+                percentile = self.percentile(stat, row[stat])
+                if percentile is not None:
+                    percentiles[stat] = percentile
+        return {
+            "season": self.season,
+            "qualified": bool(row['qualified']),
+            "qualified_players": int(self.players['qualified'].sum()),
+            "percentiles": percentiles
+        }
+
+class PercentileService:
+    """
+    Per-season percentile tables kept in step with the cached league stats
+    frame, at most percentile_max_tables seasons (least recently used first out).
+    """
+
+    def __init__(self):
+        self._tables: "OrderedDict[str, PercentileTable]" = OrderedDict()
+
+    async def get_table(self, season: str) -> PercentileTable:
+        """The season's table, refreshed if the league frame's content changed since the last call"""
+        # read before the frame, so a concurrent reload can only cause one extra diff
+        version = await get_version(f"league_player_stats:{season}")
+        df = await nba_service.get_league_player_stats(season)
+        table = self._tables.get(season)
+        if table is None:
+            table = self._tables[season] = PercentileTable(season)
+            while len(self._tables) > settings.percentile_max_tables:
+                self._tables.popitem(last=False)
+        self._tables.move_to_end(season)
+
+        # an L1 expiry hands back an equal frame as a new object, so compare content
+        # versions; without one (e.g. the version entry expired) fall back to identity
+        current = version.etag if version is not None else None
+        if current is not None:
+            outdated = table.version != current
+        else:
+            outdated = table.source is not df
+        if outdated:
+            table.version = current
+            changes = table.refresh(df)
+            if changes:
+                logger.info(f"Percentile table {season}: {changes} players changed")
+        return table
+
+    async def player_percentiles(self, player_id: int, season: str, stats: Optional[List[str]] = None) -> Optional[dict]:
+        """League percentiles for a player-season, or None if unavailable"""
+        try:
+            table = await self.get_table(season)
+            return table.player_percentiles(player_id, stats)
+        except Exception as e:
+            logger.error(f"Error getting league percentiles for player {player_id} in {season}: {e}")
+            return None
+
+# global percentile service instance
+percentile_service = PercentileService()
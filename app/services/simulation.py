@@ -0,0 +1,174 @@
+import asyncio
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+import numpy as np
+import logging
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class EraRules(NamedTuple):
+    pace_factor: float       # possessions relative to today's game
+    ortg_shift: float        # league offensive efficiency vs. modern, points per 100
+    three_share: float       # share of scoring possessions worth 3
+    efficiency_sd: float     # game-to-game spread of a team's efficiency, points per 100
+    pace_sd: float           # game-to-game spread of possessions
+
+ERA_RULES: Dict[str, EraRules] = {
+    "modern": EraRules(1.00, 0.0, 0.40, 4.0, 4.0),
+    "2010s": EraRules(0.95, -4.0, 0.30, 4.0, 4.0),
+    "2000s": EraRules(0.92, -6.0, 0.22, 4.5, 4.0),
+    "1990s": EraRules(0.93, -5.0, 0.18, 4.5, 4.5),
+    "1980s": EraRules(1.05, -3.0, 0.05, 5.0, 5.0),
+}
+
+# overtime is 5 of 48 minutes
+OVERTIME_FRACTION = 5 / 48
+MAX_OVERTIMES = 4
+
+def _score(rng: np.random.Generator, possessions: np.ndarray, efficiency: np.ndarray, three_share: float) -> np.ndarray:
+    """Points from a number of possessions at a given efficiency (points per 100)"""
+    points_per_score = 2 + three_share
+    score_prob = np.clip(efficiency / (100 * points_per_score), 0.0, 1.0)
+    scores = rng.binomial(possessions, score_prob)
+    return 2 * scores + rng.binomial(scores, three_share)
+
+def simulate_games(
+    team1_efficiency: float,
+    team2_efficiency: float,
+    pace: float,
+    era: str,
+    simulations: int,
+    seed
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate games in batched arrays. Efficiencies are each team's expected
+    points per 100 possessions against this opponent. Returns both teams'
+    final scores and the number of overtimes per game.
+    """
+    rules = ERA_RULES[era]
+    rng = np.random.default_rng(seed)
+
+    # shared possessions per game, then each team's efficiency for that game
+    possessions = np.maximum(rng.normal(pace * rules.pace_factor, rules.pace_sd, simulations), 60).round().astype(np.int64)
+    efficiency1 = rng.normal(team1_efficiency + rules.ortg_shift, rules.efficiency_sd, simulations)
+    efficiency2 = rng.normal(team2_efficiency + rules.ortg_shift, rules.efficiency_sd, simulations)
+
+    score1 = _score(rng, possessions, efficiency1, rules.three_share)
+    score2 = _score(rng, possessions, efficiency2, rules.three_share)
+    overtimes = np.zeros(simulations, dtype=np.int64)
+
+    overtime_possessions = np.maximum((possessions * OVERTIME_FRACTION).round().astype(np.int64), 1)
+    for _ in range(MAX_OVERTIMES):
+        tied = np.flatnonzero(score1 == score2)
+        if tied.size == 0:
+            break
+        score1[tied] += _score(rng, overtime_possessions[tied], efficiency1[tied], rules.three_share)
+        score2[tied] += _score(rng, overtime_possessions[tied], efficiency2[tied], rules.three_share)
+        overtimes[tied] += 1
+
+    # settle anything still tied with a final possession each way
+    tied = np.flatnonzero(score1 == score2)
+    if tied.size:
+        team1_wins = rng.random(tied.size) < 0.5
+        score1[tied[team1_wins]] += 1
+        score2[tied[~team1_wins]] += 1
+
+    return score1, score2, overtimes
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def start_pool():
+    """
+    Create the simulation process pool (called on app startup). Workers
+    come from a forkserver (spawn where unavailable) rather than a fork of
+    the running app, which would copy its event loop, locks and open
+    Redis/database connections into every worker.
+    """
+    global _pool
+    if _pool is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.simulation_workers,
+            mp_context=multiprocessing.get_context(method)
+        )
+
+def _get_pool() -> ProcessPoolExecutor:
+    # outside the app (e.g. scripts) the pool is created on first use
+    start_pool()
+    return _pool
+
+def shutdown_pool():
+    """Stop the simulation process pool (called on app shutdown)"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+    return {
+        "mean": round(float(values.mean()), 1),
+        "std": round(float(values.std()), 1),
+        "p5": round(float(p5), 1),
+        "p25": round(float(p25), 1),
+        "median": round(float(p50), 1),
+        "p75": round(float(p75), 1),
+        "p95": round(float(p95), 1)
+    }
+
+async def run_simulation(
+    team1_efficiency: float,
+    team2_efficiency: float,
+    pace: float,
+    era: str,
+    simulations: int,
+    seed_key: str
+) -> Dict[str, Any]:
+    """
+    Run a matchup simulation off the event loop. Counts above the chunk size
+    are split across the process pool; the seed is derived from seed_key so
+    identical requests give identical results.
+    """
+    loop = asyncio.get_event_loop()
+    chunk_size = settings.simulation_chunk_size
+    chunks = [min(chunk_size, simulations - start) for start in range(0, simulations, chunk_size)]
+    seeds = np.random.SeedSequence(zlib.crc32(seed_key.encode())).spawn(len(chunks))
+
+    if len(chunks) == 1:
+        results = [await loop.run_in_executor(
+            None, simulate_games, team1_efficiency, team2_efficiency, pace, era, chunks[0], seeds[0]
+        )]
+    else:
+        pool = _get_pool()
+        results = await asyncio.gather(*[
+            loop.run_in_executor(pool, simulate_games, team1_efficiency, team2_efficiency, pace, era, size, seed)
+            for size, seed in zip(chunks, seeds)
+        ])
+
+    score1 = np.concatenate([r[0] for r in results])
+    score2 = np.concatenate([r[1] for r in results])
+    overtimes = np.concatenate([r[2] for r in results])
+    margin = score1 - score2
+
+    win_prob = float((margin > 0).mean())
+    # normal approximation to the binomial for the win probability interval
+    half_width = 1.96 * np.sqrt(win_prob * (1 - win_prob) / simulations)
+    margin_bins = np.arange(np.floor(margin.min() / 5) * 5, np.ceil(margin.max() / 5) * 5 + 5, 5)
+    margin_counts, _ = np.histogram(margin, bins=margin_bins)
+
+    return {
+        "team1_win_probability": win_prob,
+        "team1_win_probability_ci95": [max(0.0, win_prob - half_width), min(1.0, win_prob + half_width)],
+        "team1_score": _distribution(score1),
+        "team2_score": _distribution(score2),
+        "margin": _distribution(margin),
+        "margin_histogram": [
+            {"from": int(low), "to": int(low + 5), "games": int(count)}
+            for low, count in zip(margin_bins[:-1], margin_counts) if count
+        ],
+        "overtime_pct": float((overtimes > 0).mean())
+    }
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import logging
+
+from ..core.config import settings
+from .cache_service import cache_service
+from ..utils.token_bucket import LoadPriority, is_background, load_priority
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Coalesce concurrent loads of the same cache key.
+
+    Within a process, callers for a key share one task. Across uvicorn
+    workers, the task only runs the loader after taking a short-lived Redis
+    lock; if another worker holds it, we poll the cache for its result.
+    The shared task's upstream priority is background only while every
+    caller waiting on it is.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._priorities: Dict[str, LoadPriority] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        recheck: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Any:
+        """
+        Run loader once per key. recheck returns the cached value (or None)
+        and is used after waiting on another worker's lock.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            if not is_background():
+                # a live caller joined, so the load no longer yields to live traffic
+                self._priorities[key].raise_to_live()
+        else:
+            self.leaders += 1
+            # a flight started by another flight's loader shares its priority
+            priority = load_priority.get() or LoadPriority(is_background())
+            task = asyncio.ensure_future(self._run_with_priority(priority, key, loader, recheck))
+            self._inflight[key] = task
+            self._priorities[key] = priority
+            task.add_done_callback(lambda t: self._finish(key, t))
+
+        # shield so a disconnecting caller doesn't cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        """Drop the registry entry and mark the result as retrieved"""
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+            self._priorities.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_with_priority(self, priority: LoadPriority, key, loader, recheck) -> Any:
+        """Runs in the task's own copy of the creator's context, so this doesn't leak back"""
+        load_priority.set(priority)
+        return await self._run_with_lock(key, loader, recheck)
+
+    async def _run_with_lock(self, key, loader, recheck) -> Any:
+        """Run loader under the cross-worker lock, or wait for the worker holding it"""
+        lock_seconds = settings.single_flight_lock_seconds
+        token = await cache_service.acquire_lock(key, lock_seconds)
+        if token is not None:
+            try:
+                return await loader()
+            finally:
+                await cache_service.release_lock(key, token)
+
+        # another worker is fetching - wait for its result to land in the cache
+        deadline = time.monotonic() + lock_seconds
+        poll_seconds = settings.single_flight_poll_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_seconds)
+            value = await recheck()
+            if value is not None:
+                return value
+            if not await cache_service.is_locked(key):
+                break
+
+        # the other worker failed or gave up; fetch ourselves
+        logger.debug(f"Single-flight wait for {key} ended without a cached value, loading directly")
+        return await loader()
+
+    def is_running(self, key: str) -> bool:
+        """Whether this process is already loading a key"""
+        return key in self._inflight
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently being loaded in this process"""
+        return len(self._inflight)
+
+# global single-flight registry
+single_flight = SingleFlight()
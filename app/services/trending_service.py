@@ -0,0 +1,247 @@
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+import pandas as pd
+import logging
+
+from ..core.config import settings
+from .nba_service import nba_service
+
+logger = logging.getLogger(__name__)
+
+# metrics tracked per game, columns of LeagueGameLog
+TRENDING_METRICS = ['PTS', 'AST', 'REB', 'STL', 'BLK', 'TOV', 'FGM', 'FGA', 'FG3M', 'FTM', 'MIN', 'PLUS_MINUS']
+
+# rolling windows in days, relative to the latest ingested game; None is the whole season
+TIMEFRAMES = {"week": 7, "month": 30, "season": None}
+
+# games needed in a window before a player is ranked
+MIN_GAMES = {"week": 2, "month": 4, "season": 5}
+
+# rows ingested before yielding back to the event loop
+INGEST_BATCH_ROWS = 1000
+
+_METRIC_INDEX = {metric: i for i, metric in enumerate(TRENDING_METRICS)}
+
+class _Window:
+    """
+    Games inside a window bucketed by date (late rows land in their own
+    day, so eviction by date stays exact) plus running per-player sums and
+    counts. The season window (days=None) never evicts, so it only keeps
+    the sums.
+    """
+
+    def __init__(self, days: Optional[int]):
+        self.days = days
+        self.games: Dict[int, List[Tuple[int, np.ndarray]]] = {}
+        self.dates: deque = deque()
+        self.totals: Dict[int, np.ndarray] = {}
+        self.counts: Dict[int, int] = {}
+
+    def append(self, day: int, player_id: int, values: np.ndarray):
+        """Store a game under its date and add it to the sums"""
+        if self.days is not None:
+            if day not in self.games:
+                self.games[day] = []
+                if not self.dates or day > self.dates[-1]:
+                    self.dates.append(day)
+                else:
+                    # late row for an earlier day
+                    insort(self.dates, day)
+            self.games[day].append((player_id, values))
+        self.add(player_id, values)
+
+    def evict(self, cutoff: int) -> Set[int]:
+        """Remove games dated on or before cutoff; returns the players affected"""
+        evicted = set()
+        while self.dates and self.dates[0] <= cutoff:
+            for player_id, values in self.games.pop(self.dates.popleft()):
+                self.remove(player_id, values)
+                evicted.add(player_id)
+        return evicted
+
+    def add(self, player_id: int, values: np.ndarray):
+        if player_id in self.totals:
+            self.totals[player_id] += values
+            self.counts[player_id] += 1
+        else:
+            self.totals[player_id] = values.copy()
+            self.counts[player_id] = 1
+
+    def remove(self, player_id: int, values: np.ndarray):
+        self.counts[player_id] -= 1
+        if self.counts[player_id] == 0:
+            del self.totals[player_id]
+            del self.counts[player_id]
+        else:
+            self.totals[player_id] -= values
+
+    def average(self, player_id: int) -> Optional[np.ndarray]:
+        count = self.counts.get(player_id)
+        return self.totals[player_id] / count if count else None
+
+class _Ranking:
+    """Players sorted by score (bisect), so the top k is a slice"""
+
+    def __init__(self):
+        self._keys: List[Tuple[float, int]] = []
+        self._scores: Dict[int, float] = {}
+
+    def update(self, player_id: int, score: Optional[float]):
+        old = self._scores.pop(player_id, None)
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (old, player_id))]
+        if score is not None and np.isfinite(score):
+            self._scores[player_id] = score
+            insort(self._keys, (score, player_id))
+
+    def top(self, limit: int) -> List[Tuple[float, int]]:
+        return self._keys[-limit:][::-1] if limit > 0 else []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class TrendingEngine:
+    """
+    Trending players for one season, maintained incrementally from per-game
+    logs. Each game adds to the running sums of every window it falls in;
+    when the latest date moves, games that slide out of a window are
+    subtracted again. Players whose sums changed are marked dirty and
+    re-scored in the per-metric rankings on flush(). Week/month rank by
+    change versus the player's season average, season ranks by average.
+    """
+
+    def __init__(self, season: str):
+        self.season = season
+        self.windows = {timeframe: _Window(days) for timeframe, days in TIMEFRAMES.items()}
+        self.rankings = {(timeframe, metric): _Ranking() for timeframe in TIMEFRAMES for metric in TRENDING_METRICS}
+        self.players: Dict[int, dict] = {}
+        self.latest_day: Optional[int] = None
+        self._seen: Set[Tuple[str, int]] = set()
+        self._dirty: Set[int] = set()
+        self.refreshed_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def _score(self, timeframe: str, player_id: int) -> Optional[np.ndarray]:
+        """Per-metric ranking scores for one player in one window"""
+        window = self.windows[timeframe]
+        if window.counts.get(player_id, 0) < MIN_GAMES[timeframe]:
+            return None
+        average = window.average(player_id)
+        if timeframe == "season":
+            return average
+
+        season_average = self.windows["season"].average(player_id)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(season_average > 0, (average - season_average) / season_average, np.nan)
+
+    def flush(self) -> int:
+        """Re-score players whose sums changed since the last flush"""
+        dirty, self._dirty = self._dirty, set()
+        for player_id in dirty:
+            for timeframe in TIMEFRAMES:
+                scores = self._score(timeframe, player_id)
+                for metric, index in _METRIC_INDEX.items():
+                    self.rankings[(timeframe, metric)].update(player_id, None if scores is None else float(scores[index]))
+        return len(dirty)
+
+    def _advance(self, day: int) -> Set[int]:
+        """Move the latest date forward and evict games that left each window"""
+        self.latest_day = day
+        evicted = set()
+        for window in self.windows.values():
+            if window.days is not None:
+                evicted |= window.evict(day - window.days)
+        return evicted
+
+    def ingest(self, day: int, game_id: str, player_id: int, values: np.ndarray) -> bool:
+        """Add one player-game (rankings update on the next flush); returns False if already ingested"""
+        if (game_id, player_id) in self._seen:
+            return False
+        self._seen.add((game_id, player_id))
+
+        if self.latest_day is None or day > self.latest_day:
+            self._dirty |= self._advance(day)
+
+        for window in self.windows.values():
+            # late rows for dates already outside a window only count towards the season
+            if window.days is not None and day <= self.latest_day - window.days:
+                continue
+            window.append(day, player_id, values)
+
+        # a new game moves the season average, which every trend is measured against
+        self._dirty.add(player_id)
+        return True
+
+    async def ingest_frame(self, df: pd.DataFrame) -> int:
+        """Ingest a game log frame in date order; returns the number of new player-games"""
+        if df.empty:
+            return 0
+
+        df = df.assign(_day=pd.to_datetime(df['GAME_DATE']).map(pd.Timestamp.toordinal)).sort_values('_day', kind='stable')
+        values = df.reindex(columns=TRENDING_METRICS).apply(pd.to_numeric, errors='coerce').fillna(0.0).to_numpy(dtype=float)
+        days = df['_day'].to_numpy()
+        game_ids = df['GAME_ID'].astype(str).to_numpy()
+        player_ids = df['PLAYER_ID'].astype(np.int64).to_numpy()
+
+        for player_id, name, team in zip(player_ids, df['PLAYER_NAME'], df.get('TEAM_ABBREVIATION', pd.Series('UNK', index=df.index))):
+            self.players[int(player_id)] = {"name": name, "team": team}
+
+        added = 0
+        for start in range(0, len(df), INGEST_BATCH_ROWS):
+            for i in range(start, min(start + INGEST_BATCH_ROWS, len(df))):
+                added += self.ingest(int(days[i]), game_ids[i], int(player_ids[i]), values[i])
+            await asyncio.sleep(0)
+        self.flush()
+        return added
+
+    def top(self, metric: str, timeframe: str, limit: int) -> List[dict]:
+        """The top players for a metric and timeframe"""
+        index = _METRIC_INDEX[metric]
+        results = []
+        for score, player_id in self.rankings[(timeframe, metric)].top(limit):
+            window = self.windows[timeframe]
+            player = self.players.get(player_id, {})
+            results.append({
+                "player": player.get("name"),
+                "player_id": player_id,
+                "team": player.get("team"),
+                "trend": None if timeframe == "season" else f"{score * 100:+.0f}%",
+                "current_avg": round(float(window.average(player_id)[index]), 1),
+                "season_avg": round(float(self.windows["season"].average(player_id)[index]), 1),
+                "games": window.counts[player_id]
+            })
+        return results
+
+    @property
+    def as_of(self) -> Optional[str]:
+        return pd.Timestamp.fromordinal(self.latest_day).date().isoformat() if self.latest_day else None
+
+class TrendingService:
+    """Per-season trending engines, topped up from the cached league game log"""
+
+    def __init__(self):
+        self._engines: Dict[str, TrendingEngine] = {}
+
+    async def get_engine(self, season: str) -> TrendingEngine:
+        """The season's engine, ingesting any new games if it is due a refresh"""
+        engine = self._engines.get(season)
+        if engine is None:
+            engine = self._engines[season] = TrendingEngine(season)
+
+        if time.monotonic() - engine.refreshed_at >= settings.trending_refresh_minutes * 60:
+            async with engine.lock:
+                # another request may have refreshed while we waited
+                if time.monotonic() - engine.refreshed_at >= settings.trending_refresh_minutes * 60:
+                    df = await nba_service.get_league_game_log(season)
+                    added = await engine.ingest_frame(df)
+                    engine.refreshed_at = time.monotonic()
+                    if added:
+                        logger.info(f"Trending {season}: ingested {added} player-games through {engine.as_of}")
+        return engine
+
+# global trending service instance
+trending_service = TrendingService()
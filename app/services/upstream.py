@@ -0,0 +1,184 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import logging
+
+from nba_api.stats.library.http import NBAStatsResponse
+
+from ..core.config import settings
+from ..core.exceptions import NBAAPIError, UpstreamReplayMissError
+
+logger = logging.getLogger(__name__)
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+UPSTREAM_MODES = (LIVE, RECORD, REPLAY)
+
+class InjectedUpstreamError(ConnectionError):
+    """Failure injected in replay mode, retried like a real network error"""
+
+class ResponseStore:
+    """
+    On-disk store of raw nba_api responses, one gzipped JSON file per
+    endpoint + params at {root}/{endpoint}/{digest}.json.gz. The file keeps
+    the params and request URL next to the response so recordings can be
+    inspected and pruned by hand.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    @staticmethod
+    def params_key(args: tuple, kwargs: Dict[str, Any]) -> str:
+        """Canonical params string: positional args plus kwargs sorted by name"""
+        return json.dumps({"args": list(args), "kwargs": kwargs}, sort_keys=True, default=str)
+
+    def path(self, endpoint: str, params: str) -> str:
+        digest = hashlib.sha1(params.encode()).hexdigest()[:20]
+        return os.path.join(self.root, endpoint, f"{digest}.json.gz")
+
+    def save(self, endpoint: str, params: str, url: str, response: str, elapsed_ms: float):
+        """Write a recording atomically (temp file + rename) so readers never see partial files"""
+        path = self.path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "endpoint": endpoint,
+            "params": json.loads(params),
+            "url": url,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "response": response
+        }
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(record, f)
+        os.replace(temp_path, path)
+
+    def load(self, endpoint: str, params: str) -> Optional[Dict[str, Any]]:
+        path = self.path(endpoint, params)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+class UpstreamAdapter:
+    """
+    Sits between NBAService._safe_api_call and the nba_api endpoint classes.
+
+    live    calls stats.nba.com
+    record  calls stats.nba.com and saves each raw response to the store
+    replay  rebuilds endpoint objects from the store without any network,
+            sleeping for the recorded (or configured) latency and failing a
+            configurable share of calls, so load tests and CI see realistic
+            timing and exercise the retry/stale paths
+
+    call() is blocking and runs on the nba_api executor threads, so replayed
+    latency occupies a worker thread just like a real request does.
+    """
+
+    def __init__(self):
+        self.mode = settings.upstream_mode.lower()
+        if self.mode not in UPSTREAM_MODES:
+            logger.error(f"Unknown UPSTREAM_MODE {settings.upstream_mode!r}, using live")
+            self.mode = LIVE
+        self.store = ResponseStore(settings.upstream_store_dir)
+        self._random = random.Random(settings.upstream_replay_seed)
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self.injected_errors = 0
+
+        if self.mode != LIVE:
+            logger.info(f"Upstream adapter in {self.mode} mode using {os.path.abspath(self.store.root)}")
+
+    def call(self, api_func, *args, **kwargs):
+        """Run one endpoint call according to the mode"""
+        if self.mode == REPLAY:
+            return self._replay(api_func, args, kwargs)
+        if self.mode == RECORD:
+            return self._record(api_func, args, kwargs)
+        return api_func(*args, **kwargs)
+
+    def _record(self, api_func, args: tuple, kwargs: Dict[str, Any]):
+        """Call upstream and persist the raw response; a failed write never fails the call"""
+        start = time.perf_counter()
+        result = api_func(*args, **kwargs)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            self.store.save(
+                api_func.__name__,
+                self.store.params_key(args, kwargs),
+                result.get_request_url(),
+                result.get_response(),
+                elapsed_ms
+            )
+            with self._lock:
+                self.recorded += 1
+        except Exception as e:
+            logger.error(f"Failed to record {api_func.__name__} response: {e}")
+        return result
+
+    def _replay(self, api_func, args: tuple, kwargs: Dict[str, Any]):
+        """Serve a recorded response, with injected latency and failures"""
+        endpoint = api_func.__name__
+        record = self.store.load(endpoint, self.store.params_key(args, kwargs))
+        if record is None:
+            with self._lock:
+                self.misses += 1
+            if settings.upstream_replay_fallthrough:
+                logger.info(f"No recording for {endpoint} {kwargs}, calling upstream")
+                return api_func(*args, **kwargs)
+            raise UpstreamReplayMissError(f"No recorded {endpoint} response for {kwargs}")
+
+        with self._lock:
+            latency_ms = settings.upstream_replay_latency_ms
+            if latency_ms is None:
+                latency_ms = record.get("elapsed_ms", 0.0)
+            latency_ms = max(0.0, latency_ms + self._random.gauss(0, settings.upstream_replay_jitter_ms))
+            fail = self._random.random() < settings.upstream_replay_error_rate
+        time.sleep(latency_ms / 1000)
+
+        if fail:
+            with self._lock:
+                self.injected_errors += 1
+            raise InjectedUpstreamError(f"Injected {endpoint} failure")
+
+        with self._lock:
+            self.replayed += 1
+        return self._rebuild(api_func, record)
+
+    @staticmethod
+    def _rebuild(api_func, record: Dict[str, Any]):
+        """An endpoint instance parsed from a recorded response, as if just fetched"""
+        endpoint = api_func.__new__(api_func)
+        endpoint.nba_response = NBAStatsResponse(
+            response=record["response"], status_code=200, url=record.get("url")
+        )
+        try:
+            endpoint.load_response()
+        except Exception as e:
+            raise NBAAPIError(f"Recorded {record['endpoint']} response could not be parsed: {e}")
+        return endpoint
+
+    def stats(self) -> Dict[str, Any]:
+        """Mode and per-process counters for /health"""
+        return {
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+            "injected_errors": self.injected_errors
+        }
+
+# global upstream adapter instance
+upstream_adapter = UpstreamAdapter()
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, NamedTuple
+import pandas as pd
+from sqlalchemy import select, delete, insert, func
+import logging
+
+from ..core.config import settings
+from ..core.database import SessionLocal, init_db
+from ..models.tables import PlayerCareerSeason, ShotEvent, TeamSeasonStat
+from ..utils.helpers import is_completed_season, frame_to_records, safe_float_conversion, safe_int_conversion
+
+logger = logging.getLogger(__name__)
+
+class StoredFrame(NamedTuple):
+    df: pd.DataFrame
+    # unix time the rows were fetched upstream, None where they no longer change (completed seasons)
+    fetched_at: Optional[float]
+
+class WarehouseService:
+    """
+    Write-through store for upstream frames. Methods are blocking and are
+    meant to be run off the event loop (see NBAService._run_blocking).
+    """
+
+    def __init__(self):
+        self.enabled = False
+
+    def initialize(self) -> bool:
+        """Create warehouse tables; disables the warehouse if the database is unreachable"""
+        if not settings.warehouse_enabled:
+            logger.info("Stat warehouse disabled by configuration")
+            return False
+
+        try:
+            init_db()
+            self.enabled = True
+            logger.info("Stat warehouse initialized successfully")
+        except Exception as e:
+            logger.warning(f"Stat warehouse initialization failed: {e}. Falling back to upstream only.")
+            self.enabled = False
+        return self.enabled
+
+    def _load(self, model, filters: Dict[str, Any], max_age: Optional[timedelta]) -> Optional[StoredFrame]:
+        """Load a frame for the given key, or None if missing or older than max_age"""
+        if not self.enabled:
+            return None
+
+        try:
+            with SessionLocal() as session:
+                conditions = [getattr(model, column) == value for column, value in filters.items()]
+
+                oldest = session.execute(select(func.min(model.fetched_at)).where(*conditions)).scalar()
+                if oldest is None:
+                    return None
+                if max_age is not None and datetime.utcnow() - oldest > max_age:
+                    return None
+
+                rows = session.execute(
+                    select(model.data).where(*conditions).order_by(model.row_index)
+                ).scalars().all()
+                fetched_at = oldest.replace(tzinfo=timezone.utc).timestamp() if max_age is not None else None
+                return StoredFrame(pd.DataFrame(list(rows)), fetched_at)
+        except Exception as e:
+            logger.error(f"Warehouse read error for {model.__tablename__} {filters}: {e}")
+            return None
+
+    def _store(self, model, filters: Dict[str, Any], df: pd.DataFrame, row_columns) -> int:
+        """Replace the rows for the given key with the frame in one bulk insert"""
+        if not self.enabled:
+            return 0
+
+        try:
+            fetched_at = datetime.utcnow()
+            records = frame_to_records(df)
+            rows = [
+                {
+                    **filters,
+                    **row_columns(record),
+                    "row_index": i,
+                    "data": record,
+                    "fetched_at": fetched_at
+                }
+                for i, record in enumerate(records)
+            ]
+
+            with SessionLocal() as session, session.begin():
+                conditions = [getattr(model, column) == value for column, value in filters.items()]
+                session.execute(delete(model).where(*conditions))
+                if rows:
+                    session.execute(insert(model), rows)
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Warehouse write error for {model.__tablename__} {filters}: {e}")
+            return 0
+
+    def load_player_career(self, player_id: int) -> Optional[StoredFrame]:
+        """Load player career seasons"""
+        return self._load(
+            PlayerCareerSeason,
+            {"player_id": player_id},
+            timedelta(hours=settings.warehouse_career_max_age_hours)
+        )
+
+    def store_player_career(self, player_id: int, df: pd.DataFrame) -> int:
+        """Store player career seasons"""
+        return self._store(
+            PlayerCareerSeason,
+            {"player_id": player_id},
+            df,
+            lambda r: {
+                "season_id": r.get('SEASON_ID'),
+                "team_id": r.get('TEAM_ID')
+            }
+        )
+
+    def load_shot_chart(self, player_id: int, season: str) -> Optional[StoredFrame]:
+        """Load shot events for a player season; completed seasons never expire"""
+        max_age = None if is_completed_season(season) else timedelta(hours=settings.warehouse_shot_chart_max_age_hours)
+        return self._load(ShotEvent, {"player_id": player_id, "season": season}, max_age)
+
+    def store_shot_chart(self, player_id: int, season: str, df: pd.DataFrame) -> int:
+        """Store shot events for a player season"""
+        return self._store(
+            ShotEvent,
+            {"player_id": player_id, "season": season},
+            df,
+            lambda r: {
+                "game_id": r.get('GAME_ID'),
+                "game_event_id": r.get('GAME_EVENT_ID'),
+                "loc_x": safe_float_conversion(r.get('LOC_X')),
+                "loc_y": safe_float_conversion(r.get('LOC_Y')),
+                "shot_made_flag": safe_int_conversion(r.get('SHOT_MADE_FLAG'))
+            }
+        )
+
+    def load_team_stats(self, season: str) -> Optional[StoredFrame]:
+        """Load team season stats; completed seasons never expire"""
+        max_age = None if is_completed_season(season) else timedelta(hours=settings.warehouse_team_stats_max_age_hours)
+        return self._load(TeamSeasonStat, {"season": season}, max_age)
+
+    def store_team_stats(self, season: str, df: pd.DataFrame) -> int:
+        """Store team season stats"""
+        return self._store(
+            TeamSeasonStat,
+            {"season": season},
+            df,
+            lambda r: {"team_id": r.get('TEAM_ID')}
+        )
+
+# global warehouse instance
+warehouse_service = WarehouseService()
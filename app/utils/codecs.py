@@ -0,0 +1,211 @@
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, NamedTuple, Tuple
+import numpy as np
+import pandas as pd
+
+from ..core.config import settings
+
+# numpy kinds stored as raw buffers: bool, ints, floats, complex, datetimes/timedeltas
+_BUFFER_KINDS = set('biufcmM')
+
+class CacheCodec:
+    """Base class for cache value codecs; the one-byte tag prefixes every encoded value"""
+    tag: bytes = b''
+
+    def can_encode(self, value: Any) -> bool:
+        raise NotImplementedError
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+class JSONCodec(CacheCodec):
+    """Plain JSON, used for everything that isn't a DataFrame"""
+    tag = b'J'
+
+    def can_encode(self, value: Any) -> bool:
+        return True
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=str).encode('utf-8')
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+class DataFrameCodec(CacheCodec):
+    """
+    Columnar DataFrame encoding: a JSON schema header followed by one buffer
+    per column. Numeric/bool/datetime columns are raw NumPy buffers, object
+    columns are JSON arrays, other extension dtypes go through object and are
+    cast back on decode. The buffer section is optionally zlib-compressed.
+
+    Layout: uint32 header length | header JSON | buffers
+    """
+    tag = b'D'
+
+    def can_encode(self, value: Any) -> bool:
+        return isinstance(value, pd.DataFrame)
+
+    def _encode_array(self, values: pd.Series) -> Tuple[Dict[str, Any], bytes]:
+        dtype = values.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in _BUFFER_KINDS:
+            buffer = np.ascontiguousarray(values.to_numpy()).tobytes()
+            return {"dtype": dtype.str, "kind": "buffer", "nbytes": len(buffer)}, buffer
+
+        kind = "json" if dtype == object else "cast"
+        if kind == "cast":
+            # missing values (pd.NA, NaT) become null and are restored by the cast
+            items = values.astype(object).where(values.notna(), None).tolist()
+        else:
+            items = values.tolist()
+        buffer = json.dumps(items, default=str).encode('utf-8')
+        return {"dtype": str(dtype), "kind": kind, "nbytes": len(buffer)}, buffer
+
+    def _decode_array(self, spec: Dict[str, Any], buffer: bytes) -> pd.Series:
+        if spec["kind"] == "buffer":
+            return pd.Series(np.frombuffer(buffer, dtype=np.dtype(spec["dtype"])).copy(), copy=False)
+
+        values = pd.Series(json.loads(bytes(buffer)), dtype=object)
+        if spec["kind"] == "cast":
+            return values.astype(spec["dtype"])
+        return values
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        columns: List[Dict[str, Any]] = []
+        buffers: List[bytes] = []
+
+        for position, name in enumerate(df.columns):
+            spec, buffer = self._encode_array(df.iloc[:, position])
+            columns.append({"name": name, **spec})
+            buffers.append(buffer)
+
+        if isinstance(df.index, pd.RangeIndex):
+            index = {"kind": "range", "start": df.index.start, "stop": df.index.stop,
+                     "step": df.index.step, "name": df.index.name}
+        else:
+            spec, buffer = self._encode_array(df.index.to_series())
+            index = {"name": df.index.name, **spec}
+            buffers.append(buffer)
+
+        body = b''.join(buffers)
+        compression = None
+        if settings.cache_compression == "zlib" and len(body) >= settings.cache_compression_min_bytes:
+            body = zlib.compress(body, settings.cache_compression_level)
+            compression = "zlib"
+
+        header = json.dumps({
+            "version": 1,
+            "rows": len(df),
+            "compression": compression,
+            "columns": columns,
+            "index": index
+        }, default=str).encode('utf-8')
+        return struct.pack('<I', len(header)) + header + body
+
+    def decode(self, data: bytes) -> pd.DataFrame:
+        (header_length,) = struct.unpack_from('<I', data)
+        header = json.loads(data[4:4 + header_length])
+        body = memoryview(data)[4 + header_length:]
+        if header["compression"] == "zlib":
+            body = memoryview(zlib.decompress(body))
+
+        offset = 0
+        arrays = []
+        for spec in header["columns"]:
+            arrays.append(self._decode_array(spec, body[offset:offset + spec["nbytes"]]))
+            offset += spec["nbytes"]
+
+        index_spec = header["index"]
+        if index_spec["kind"] == "range":
+            index = pd.RangeIndex(index_spec["start"], index_spec["stop"], index_spec["step"], name=index_spec["name"])
+        else:
+            index_values = self._decode_array(index_spec, body[offset:offset + index_spec["nbytes"]])
+            index = pd.Index(index_values, dtype=index_values.dtype, name=index_spec["name"])
+
+        # build positionally so duplicate column names survive
+        df = pd.DataFrame(dict(enumerate(arrays)), index=pd.RangeIndex(header["rows"]))
+        df.columns = [spec["name"] for spec in header["columns"]]
+        df.index = index
+        return df
+
+class CacheEnvelope(NamedTuple):
+    """A cached value with soft and hard expiry (epoch seconds), for stale-while-revalidate"""
+    value: Any
+    soft_expires_at: float
+    hard_expires_at: float
+
+class EnvelopeCodec(CacheCodec):
+    """
+    Two float64 expiry timestamps followed by the wrapped value, itself
+    encoded (and tagged) by whichever codec handles it.
+    """
+    tag = b'E'
+
+    def can_encode(self, value: Any) -> bool:
+        return isinstance(value, CacheEnvelope)
+
+    def encode(self, envelope: CacheEnvelope) -> bytes:
+        return struct.pack('<dd', envelope.soft_expires_at, envelope.hard_expires_at) + encode_value(envelope.value)
+
+    def decode(self, data: bytes) -> CacheEnvelope:
+        soft_expires_at, hard_expires_at = struct.unpack_from('<dd', data)
+        return CacheEnvelope(decode_value(data[16:]), soft_expires_at, hard_expires_at)
+
+class RenderedResponse(NamedTuple):
+    """Serialized response bytes plus the content versions of the cache entries it was built from"""
+    body: bytes
+    media_type: str
+    sources: Dict[str, str]
+
+class RenderedResponseCodec(CacheCodec):
+    """
+    Layout: uint32 header length | header JSON (media type, sources) | body,
+    so the body bytes are stored as-is rather than escaped into JSON.
+    """
+    tag = b'R'
+
+    def can_encode(self, value: Any) -> bool:
+        return isinstance(value, RenderedResponse)
+
+    def encode(self, rendered: RenderedResponse) -> bytes:
+        header = json.dumps({"media_type": rendered.media_type, "sources": rendered.sources}).encode('utf-8')
+        return struct.pack('<I', len(header)) + header + rendered.body
+
+    def decode(self, data: bytes) -> RenderedResponse:
+        (header_length,) = struct.unpack_from('<I', data)
+        header = json.loads(data[4:4 + header_length])
+        return RenderedResponse(bytes(data[4 + header_length:]), header["media_type"], header["sources"])
+
+# registered codecs, tried in order; JSON last as the catch-all
+_codecs: List[CacheCodec] = []
+
+def register_codec(codec: CacheCodec, first: bool = True):
+    """Register a codec; by default it takes precedence over existing ones"""
+    if first:
+        _codecs.insert(0, codec)
+    else:
+        _codecs.append(codec)
+
+def encode_value(value: Any) -> bytes:
+    """Encode a value with the first codec that accepts it, prefixed by its tag"""
+    for codec in _codecs:
+        if codec.can_encode(value):
+            return codec.tag + codec.encode(value)
+    raise TypeError(f"No cache codec for {type(value).__name__}")
+
+def decode_value(data: bytes) -> Any:
+    """Decode a tagged value; untagged data is treated as legacy JSON"""
+    tag = data[:1]
+    for codec in _codecs:
+        if codec.tag == tag:
+            return codec.decode(data[1:])
+    return json.loads(data)
+
+register_codec(JSONCodec(), first=False)
+register_codec(DataFrameCodec())
+register_codec(EnvelopeCodec())
+register_codec(RenderedResponseCodec())
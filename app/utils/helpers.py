@@ -83,4 +83,30 @@ def safe_int_conversion(value, default=0) -> int:
             return default
         return int(float(value))
     except (ValueError, TypeError):
-        return default
\ No newline at end of file
+        return default
+
+def is_completed_season(season: str) -> bool:
+    """Check whether a season (e.g. '2022-23') finished before the current one"""
+    from ..models.schemas import Season
+
+    try:
+        return int(season[:4]) < int(Season.CURRENT.value[:4])
+    except (ValueError, TypeError):
+        return False
+
+def season_range(start: str, end: str) -> List[str]:
+    """
+    Seasons from start to end inclusive ('2021-22', '2023-24' -> three
+    seasons). Raises ValueError for a season whose suffix isn't the year
+    after its start ('2021-25').
+    """
+    for season in (start, end):
+        expected = f"{season[:4]}-{str(int(season[:4]) + 1)[-2:]}"
+        if season != expected:
+            raise ValueError(f"Invalid season '{season}', did you mean '{expected}'?")
+    start_year, end_year = int(start[:4]), int(end[:4])
+    return [f"{year}-{str(year + 1)[-2:]}" for year in range(start_year, end_year + 1)]
+
+def frame_to_records(df: pd.DataFrame) -> List[dict]:
+    """Convert a DataFrame to JSON-safe records (NaN becomes None)"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
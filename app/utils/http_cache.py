@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import time
+from contextlib import contextmanager
+from email.utils import formatdate
+from functools import wraps
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import pandas as pd
+from fastapi import Request, Response
+
+from ..core.config import settings
+from ..core.middleware import request_state, response_state
+from ..services.cache_service import cache_service
+from .codecs import encode_value
+from .route_params import REQUEST_PARAM, RESPONSE_PARAM, injected_signature, take_param
+
+# how long a route remembers which cache entries its last response was built from
+DEPENDENCIES_TTL_MINUTES = 24 * 60
+
+class ContentVersion(NamedTuple):
+    etag: str
+    modified: float
+
+def version_key(cache_key: str) -> str:
+    return f"ver:{cache_key}"
+
+def content_version(df: pd.DataFrame) -> str:
+    """Digest of a frame's columns and values, independent of when it was fetched"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(column) for column in df.columns]).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # unhashable cells (lists, dicts) - fall back to the cache encoding
+        digest.update(encode_value(df))
+    return digest.hexdigest()
+
+async def record_version(cache_key: str, df: pd.DataFrame, ttl_minutes: int) -> bool:
+    """
+    Store the content version next to a cache entry. Last-Modified only
+    moves when the content actually changed, so refreshes that return the
+    same data keep validating. Returns whether a different version was
+    replaced.
+    """
+    etag = content_version(df)
+    previous = await get_version(cache_key)
+    modified = previous.modified if previous is not None and previous.etag == etag else time.time()
+    await cache_service.set(version_key(cache_key), {"etag": etag, "modified": modified}, ttl_minutes=ttl_minutes)
+    return previous is not None and previous.etag != etag
+
+async def get_version(cache_key: str) -> Optional[ContentVersion]:
+    stored = await cache_service.get(version_key(cache_key))
+    return ContentVersion(stored["etag"], stored["modified"]) if stored else None
+
+def tracking_sources() -> bool:
+    """Whether the current request wants to know which cache entries it reads"""
+    state = response_state.get()
+    return state is not None and "sources" in state
+
+def record_source(cache_key: str, version: Optional[ContentVersion]):
+    """Note a cache entry (and its version when read) used by the current response"""
+    state = response_state.get()
+    if state is not None and "sources" in state:
+        state["sources"].setdefault(cache_key, version)
+
+@contextmanager
+def source_tracking() -> Iterator[Dict[str, Optional[ContentVersion]]]:
+    """Collect the cache entries read inside the block, with the versions they had when read"""
+    with request_state() as state:
+        outer = state.get("sources")
+        sources = state["sources"] = {}
+        try:
+            yield sources
+        finally:
+            if outer is None:
+                state.pop("sources", None)
+            else:
+                # an enclosing tracker (e.g. conditional_get around cached_response) sees them too
+                for cache_key, version in sources.items():
+                    outer.setdefault(cache_key, version)
+                state["sources"] = outer
+
+class Validator(NamedTuple):
+    etag: str
+    last_modified: float
+
+    def headers(self, max_age: int) -> Dict[str, str]:
+        return {
+            "ETag": f'"{self.etag}"',
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={max_age}, must-revalidate"
+        }
+
+def _route_key(request: Request) -> str:
+    """Path plus sorted query string, so parameter order doesn't matter"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+def _validator(route_key: str, versions: Dict[str, ContentVersion]) -> Validator:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{settings.app_version}|{route_key}".encode())
+    for cache_key in sorted(versions):
+        digest.update(f"|{cache_key}={versions[cache_key].etag}".encode())
+    return Validator(digest.hexdigest(), max(v.modified for v in versions.values()))
+
+async def _current_validator(route_key: str) -> Optional[Validator]:
+    """Validator for a route from the current versions of the entries it was last built from"""
+    sources: Optional[List[str]] = await cache_service.get(f"etag_deps:{route_key}")
+    if not sources:
+        return None
+    versions = await asyncio.gather(*(get_version(key) for key in sources))
+    if any(version is None for version in versions):
+        return None
+    return _validator(route_key, dict(zip(sources, versions)))
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == f'"{etag}"':
+            return True
+    return False
+
+def conditional_get(max_age: int = None):
+    """
+    ETag/Last-Modified support for read endpoints built from cached frames.
+
+    While the handler runs, every frame it reads through the data layer is
+    recorded with its content version; the ETag is a digest of those
+    versions and the request path/query, and the list of entries is kept
+    per route. A later request whose If-None-Match matches the ETag
+    recomputed from the entries' current versions is answered with 304
+    before the handler (and any DataFrame work) runs.
+    """
+    def decorator(func):
+        signature, added = injected_signature(func, REQUEST_PARAM, RESPONSE_PARAM)
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = take_param(kwargs, REQUEST_PARAM, added)
+            response = take_param(kwargs, RESPONSE_PARAM, added)
+            seconds = settings.http_cache_max_age_seconds if max_age is None else max_age
+            route_key = _route_key(request)
+
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match:
+                validator = await _current_validator(route_key)
+                if validator is not None and _etag_matches(if_none_match, validator.etag):
+                    return Response(status_code=304, headers=validator.headers(seconds))
+
+            with source_tracking() as sources:
+                result = await func(*args, **kwargs)
+
+            # entries loaded during this request had no version when first read
+            for cache_key, version in sources.items():
+                if version is None:
+                    sources[cache_key] = await get_version(cache_key)
+
+            if sources and all(version is not None for version in sources.values()):
+                validator = _validator(route_key, sources)
+                # FastAPI only merges headers from the injected response into responses it builds
+                target = result if isinstance(result, Response) else response
+                target.headers.update(validator.headers(seconds))
+                await cache_service.set(f"etag_deps:{route_key}", sorted(sources), ttl_minutes=DEPENDENCIES_TTL_MINUTES)
+            return result
+
+        wrapper.__signature__ = signature
+        return wrapper
+    return decorator
@@ -1,56 +1,151 @@
+import hashlib
+import math
 import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Dict, List
-from fastapi import HTTPException
+from typing import Callable, NamedTuple, Optional
+import logging
+from fastapi import HTTPException, Request
 from ..core.config import settings
-from ..core.exceptions import RateLimitExceededError
+from ..services.cache_service import cache_service
+from .route_params import REQUEST_PARAM, injected_signature, take_param
+
+logger = logging.getLogger(__name__)
+
+# GCRA: each client key holds one number, its theoretical arrival time (TAT).
+# A call is allowed while TAT + interval stays within `period` of now, which
+# permits a burst of max_calls and then one call per interval. One GET/SET per
+# check in a single round-trip; the key expires once the client is idle.
+_GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if allow_at > now then
+    return {0, tostring(allow_at - now), 0}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0', math.floor((period - (new_tat - now)) / interval + 1e-9)}
+"""
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    retry_after: float
+    remaining: int
 
 class RateLimiter:
-    def __init__(self):
-        self.call_history: Dict[str, List[float]] = {}
-    
-    def is_allowed(self, identifier: str, max_calls: int = None, period: int = None) -> bool:
-        """Check if request is allowed based on rate limit"""
+    """
+    Per-client GCRA limiter shared by all workers through Redis, with a
+    bounded in-process LRU of TATs when Redis is disabled or unreachable.
+    Memory per client is a single float in either store.
+    """
+
+    def __init__(self, max_local_clients: int):
+        self.max_local_clients = max_local_clients
+        self._local: "OrderedDict[str, float]" = OrderedDict()
+
+    def _check_local(self, key: str, interval: float, period: float) -> RateLimitResult:
+        now = time.monotonic()
+        tat = max(self._local.get(key, now), now)
+        new_tat = tat + interval
+        allow_at = new_tat - period
+        if allow_at > now:
+            return RateLimitResult(False, allow_at - now, 0)
+
+        self._local[key] = new_tat
+        self._local.move_to_end(key)
+        # forgetting the least recently seen client only makes it more lenient
+        while len(self._local) > self.max_local_clients:
+            self._local.popitem(last=False)
+        return RateLimitResult(True, 0.0, math.floor((period - (new_tat - now)) / interval + 1e-9))
+
+    async def check(self, identifier: str, scope: str, max_calls: int = None, period: int = None) -> RateLimitResult:
+        """Count a call by a client against a route's limit"""
         max_calls = max_calls or settings.rate_limit_calls
         period = period or settings.rate_limit_period
-        
-        current_time = time.time()
-        
-        # clean old entries
-        if identifier in self.call_history:
-            self.call_history[identifier] = [
-                call_time for call_time in self.call_history[identifier]
-                if current_time - call_time < period
-            ]
-        else:
-            self.call_history[identifier] = []
-        
-        # check if under limit
-        if len(self.call_history[identifier]) >= max_calls:
-            return False
-        
-        # qdd current call
-        self.call_history[identifier].append(current_time)
-        return True
-
-rate_limiter = RateLimiter()
-
-def rate_limit(calls_per_minute: int = None, identifier_func=None):
-    """Rate limiting decorator"""
+        interval = period / max_calls
+        key = f"rate_limit:{scope}:{identifier}"
+
+        if cache_service.enabled:
+            try:
+                allowed, retry_after, remaining = await cache_service.redis.eval(
+                    _GCRA_SCRIPT, 1, key, interval, period
+                )
+                return RateLimitResult(bool(int(allowed)), float(retry_after), int(remaining))
+            except Exception as e:
+                logger.warning(f"Shared rate limiter unavailable, using local limiter: {e}")
+        return self._check_local(key, interval, period)
+
+rate_limiter = RateLimiter(settings.rate_limit_max_local_clients)
+
+def _key_digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+# configured keys by digest; unknown keys don't get a bucket of their own,
+# otherwise a fresh random key per request would bypass the limit
+_KNOWN_KEYS = {_key_digest(key) for key in settings.api_keys}
+
+def client_ip(request: Request) -> str:
+    """
+    The client address as seen by the outermost trusted proxy. Each proxy
+    appends the address it received the request from, so with N trusted
+    hops the client is the Nth entry from the right; anything further left
+    was sent by the client and can't be trusted.
+    """
+    peer = request.client.host if request.client else "unknown"
+    hops = settings.trusted_proxy_hops
+    if hops > 0:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return peer
+
+def client_identifier(request: Request) -> str:
+    """A configured API key (hashed, never stored as-is) if one was sent, otherwise the client IP"""
+    api_key = request.headers.get(settings.api_key_header)
+    if api_key:
+        digest = _key_digest(api_key)
+        if digest in _KNOWN_KEYS:
+            return "key:" + digest[:16]
+    return "ip:" + client_ip(request)
+
+def rate_limit(calls_per_minute: int = None, identifier_func: Optional[Callable[[Request], str]] = None):
+    """
+    Rate limiting decorator for route handlers, limiting each client
+    separately. The wrapper's signature gains a Request parameter so
+    FastAPI passes the request in; it is not forwarded to the handler.
+    """
+    identify = identifier_func or client_identifier
+
     def decorator(func):
+        scope = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        signature, added = injected_signature(func, REQUEST_PARAM)
+
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # extract identifier (could be IP, user ID, etc)
-            identifier = "default"
-            if identifier_func:
-                identifier = identifier_func(*args, **kwargs)
-            
-            if not rate_limiter.is_allowed(identifier, calls_per_minute):
+            request = take_param(kwargs, REQUEST_PARAM, added)
+            max_calls = calls_per_minute or settings.rate_limit_calls
+            result = await rate_limiter.check(identify(request), scope, max_calls, 60 if calls_per_minute else None)
+
+            if not result.allowed:
                 raise HTTPException(
                     status_code=429,
-                    detail=f"Rate limit exceeded. Max {calls_per_minute or settings.rate_limit_calls} calls per minute."
+                    detail=f"Rate limit exceeded. Max {max_calls} calls per minute.",
+                    headers={
+                        "Retry-After": str(max(1, math.ceil(result.retry_after))),
+                        "X-RateLimit-Limit": str(max_calls),
+                        "X-RateLimit-Remaining": "0"
+                    }
                 )
-            
+
             return await func(*args, **kwargs)
+
+        wrapper.__signature__ = signature
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
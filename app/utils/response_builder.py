@@ -0,0 +1,77 @@
+from typing import Any, List, NamedTuple, Optional, Type
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from ..core.exceptions import DataProcessingError
+
+class ColumnSpec(NamedTuple):
+    """Maps one source DataFrame column to one response field"""
+    field: str
+    column: str
+    kind: str = 'float'              # float, int, str or bool
+    default: Any = None              # used when the column is missing
+    fill: Any = None                 # used for missing values (NaN/None)
+    decimals: Optional[int] = None   # round floats
+
+_ZERO = {'float': 0.0, 'int': 0, 'str': 'Unknown', 'bool': False}
+
+def _convert(df: pd.DataFrame, spec: ColumnSpec) -> pd.Series:
+    """Convert a whole column at once, mirroring safe_float/int_conversion"""
+    default = _ZERO[spec.kind] if spec.default is None else spec.default
+    fill = _ZERO[spec.kind] if spec.fill is None else spec.fill
+
+    if spec.column not in df.columns:
+        return pd.Series(default, index=df.index)
+
+    source = df[spec.column]
+    if spec.kind == 'str':
+        return source.where(source.notna(), fill).astype(str)
+
+    values = pd.to_numeric(source, errors='coerce')
+    if spec.kind == 'bool':
+        return values == 1
+
+    values = values.fillna(fill).astype(float)
+    if spec.kind == 'int':
+        return np.trunc(values).astype(np.int64)
+
+    return values.round(spec.decimals) if spec.decimals is not None else values
+
+def convert_columns(df: pd.DataFrame, specs: List[ColumnSpec]) -> pd.DataFrame:
+    """Build a frame of response fields from a source frame"""
+    return pd.DataFrame({spec.field: _convert(df, spec) for spec in specs}, index=df.index)
+
+def _field_bounds(model: Type[BaseModel], field: str):
+    """ge/le constraints declared on a model field"""
+    lower = upper = None
+    for constraint in model.model_fields[field].metadata:
+        lower = getattr(constraint, 'ge', lower)
+        upper = getattr(constraint, 'le', upper)
+    return lower, upper
+
+def validate_ranges(frame: pd.DataFrame, model: Type[BaseModel]):
+    """Check each numeric column against the model's bounds once, instead of once per row"""
+    for field in frame.columns:
+        if field not in model.model_fields or frame.empty:
+            continue
+        column = frame[field]
+        if column.dtype == object or column.dtype == bool:
+            continue
+
+        lower, upper = _field_bounds(model, field)
+        if lower is not None and column.min() < lower:
+            raise DataProcessingError(f"{model.__name__}.{field} below {lower}: {column.min()}")
+        if upper is not None and column.max() > upper:
+            raise DataProcessingError(f"{model.__name__}.{field} above {upper}: {column.max()}")
+
+def build_records(df: pd.DataFrame, specs: List[ColumnSpec], model: Optional[Type[BaseModel]] = None) -> List[dict]:
+    """Convert, validate and emit response rows as plain dicts in one pass"""
+    frame = convert_columns(df, specs)
+    if model is not None:
+        validate_ranges(frame, model)
+    return to_records(frame)
+
+def to_records(frame: pd.DataFrame) -> List[dict]:
+    """Rows of a converted frame as dicts of native Python values"""
+    return frame.to_dict('records')
@@ -0,0 +1,129 @@
+import asyncio
+import enum
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Dict, Optional
+from fastapi import Request, Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel
+import logging
+
+from ..core.config import settings
+from ..core.middleware import response_state
+from ..services.cache_service import cache_service
+from .codecs import RenderedResponse
+from .http_cache import get_version, record_source, source_tracking
+from .route_params import REQUEST_PARAM, injected_signature, take_param
+
+logger = logging.getLogger(__name__)
+
+def _canonical(value: Any) -> Any:
+    """JSON-ready form of a validated handler argument"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+def _cache_key(scope: str, kwargs: Dict[str, Any]) -> str:
+    """Route plus the handler's validated arguments, so defaults and parameter order don't matter"""
+    params = json.dumps({name: _canonical(value) for name, value in kwargs.items()}, sort_keys=True, default=str)
+    digest = hashlib.blake2b(f"{settings.app_version}|{params}".encode(), digest_size=16).hexdigest()
+    return f"rendered:{scope}:{digest}"
+
+def _find_route(request: Request) -> Optional[APIRoute]:
+    """The APIRoute being served (its response model and response class)"""
+    endpoint = request.scope.get("endpoint")
+    for route in request.app.routes:
+        if isinstance(route, APIRoute) and route.endpoint is endpoint:
+            return route
+    return None
+
+async def _render(route: APIRoute, content: Any) -> Response:
+    """Validate and serialize a handler's return value exactly as FastAPI would"""
+    serialized = await serialize_response(
+        field=route.response_field,
+        response_content=content,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+        is_coroutine=True
+    )
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+    if route.status_code is not None:
+        return response_class(content=serialized, status_code=route.status_code)
+    return response_class(content=serialized)
+
+def cached_response(ttl_minutes: int = None):
+    """
+    Opt-in cache of a route's serialized response bytes.
+
+    Keyed by the route and its validated arguments. Each entry stores the
+    content versions of the cache entries the handler read (see
+    http_cache.record_source); a hit is only served while all of them are
+    unchanged, so refreshing team_stats:* or shot_chart:* drops dependent
+    responses without any explicit invalidation. Responses built from stale
+    data, or from frames without a version, are not cached.
+    """
+    def decorator(func):
+        scope = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        signature, added = injected_signature(func, REQUEST_PARAM)
+        routes: Dict[str, APIRoute] = {}
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = take_param(kwargs, REQUEST_PARAM, added)
+            cache_key = _cache_key(scope, kwargs)
+
+            cached: Optional[RenderedResponse] = await cache_service.get(cache_key)
+            if cached is not None:
+                versions = await asyncio.gather(*(get_version(key) for key in cached.sources))
+                if all(
+                    version is not None and version.etag == cached.sources[key]
+                    for key, version in zip(cached.sources, versions)
+                ):
+                    # let an enclosing conditional_get build its ETag from the same sources
+                    for key, version in zip(cached.sources, versions):
+                        record_source(key, version)
+                    return Response(content=cached.body, media_type=cached.media_type)
+
+            with source_tracking() as sources:
+                result = await func(*args, **kwargs)
+
+            if isinstance(result, Response):
+                # already rendered (e.g. trusted_response); streams and errors aren't cached
+                if result.status_code != 200 or not isinstance(getattr(result, "body", None), bytes):
+                    return result
+                response = result
+            else:
+                route = routes.get("route") or _find_route(request)
+                if route is None:
+                    logger.warning(f"Response cache could not find the route for {scope}; not caching")
+                    return result
+                routes["route"] = route
+                response = await _render(route, result)
+
+            for key, version in sources.items():
+                if version is None:
+                    sources[key] = await get_version(key)
+            state = response_state.get() or {}
+            if sources and all(sources.values()) and "stale_seconds" not in state:
+                rendered = RenderedResponse(
+                    response.body,
+                    response.media_type,
+                    {key: version.etag for key, version in sources.items()}
+                )
+                ttl = settings.response_cache_ttl_minutes if ttl_minutes is None else ttl_minutes
+                await cache_service.set(cache_key, rendered, ttl_minutes=ttl)
+            return response
+
+        wrapper.__signature__ = signature
+        return wrapper
+    return decorator
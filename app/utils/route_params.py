@@ -0,0 +1,35 @@
+import inspect
+from typing import Any, Callable, Dict, Set, Tuple
+from fastapi import Request, Response
+
+# FastAPI keeps one parameter name per special type (Request, Response), so
+# stacked decorators share these instead of each adding its own
+REQUEST_PARAM = "_injected_request"
+RESPONSE_PARAM = "_injected_response"
+
+_ANNOTATIONS = {REQUEST_PARAM: Request, RESPONSE_PARAM: Response}
+
+def injected_signature(func: Callable, *names: str) -> Tuple[inspect.Signature, Set[str]]:
+    """
+    func's signature plus keyword-only Request/Response parameters for any of
+    names it doesn't already have (e.g. from an inner decorator). Returns
+    the signature and the names this wrapper added.
+    """
+    signature = inspect.signature(func)
+    parameters = list(signature.parameters.values())
+    position = next(
+        (i for i, p in enumerate(parameters) if p.kind == inspect.Parameter.VAR_KEYWORD),
+        len(parameters)
+    )
+    added = set()
+    for name in names:
+        if name in signature.parameters:
+            continue
+        parameters.insert(position, inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=_ANNOTATIONS[name]))
+        position += 1
+        added.add(name)
+    return signature.replace(parameters=parameters), added
+
+def take_param(kwargs: Dict[str, Any], name: str, added: Set[str]) -> Any:
+    """An injected value: removed if this wrapper added it, left in place for the inner function otherwise"""
+    return kwargs.pop(name) if name in added else kwargs[name]
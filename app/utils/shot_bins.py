@@ -0,0 +1,79 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+# columns that identify a court zone in both the shot and league average frames
+ZONE_COLUMNS = ['SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA', 'SHOT_ZONE_RANGE']
+
+def league_expectation(shot_df: pd.DataFrame, league_avg_df: Optional[pd.DataFrame]) -> Optional[np.ndarray]:
+    """League FG% for the zone of every shot (NaN where the zone is unknown)"""
+    if league_avg_df is None or league_avg_df.empty:
+        return None
+    keys = [c for c in ZONE_COLUMNS if c in shot_df.columns and c in league_avg_df.columns]
+    if not keys:
+        return None
+
+    league = league_avg_df.groupby(keys, as_index=False).agg(FGA=('FGA', 'sum'), FGM=('FGM', 'sum'))
+    league['LEAGUE_FG_PCT'] = np.where(league['FGA'] > 0, league['FGM'] / league['FGA'].where(league['FGA'] > 0, 1), np.nan)
+    merged = shot_df[keys].merge(league[keys + ['LEAGUE_FG_PCT']], on=keys, how='left')
+    return merged['LEAGUE_FG_PCT'].to_numpy(dtype=float)
+
+def _aggregate(group_ids: np.ndarray, made: np.ndarray, expected: Optional[np.ndarray]) -> pd.DataFrame:
+    """Per-group attempts, makes, FG% and league comparison via bincount"""
+    attempts = np.bincount(group_ids)
+    makes = np.bincount(group_ids, weights=made)
+    result = pd.DataFrame({
+        'attempts': attempts.astype(np.int64),
+        'makes': makes.astype(np.int64),
+        'fg_pct': np.round(makes / np.maximum(attempts, 1), 3)
+    })
+
+    if expected is not None:
+        known = ~np.isnan(expected)
+        known_attempts = np.bincount(group_ids, weights=known, minlength=len(attempts))
+        expected_sum = np.bincount(group_ids, weights=np.where(known, expected, 0.0), minlength=len(attempts))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            league_pct = np.where(known_attempts > 0, expected_sum / known_attempts, np.nan)
+        result['league_fg_pct'] = np.round(league_pct, 3)
+        result['fg_pct_vs_league'] = np.round(result['fg_pct'] - league_pct, 3)
+    return result
+
+def hexbin_shots(shot_df: pd.DataFrame, bin_size: float, league_avg_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Bin shots into a hexagonal grid over LOC_X/LOC_Y (tenths of feet).
+    bin_size is the distance between neighbouring hexagon centres.
+    """
+    x = pd.to_numeric(shot_df['LOC_X'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    y = pd.to_numeric(shot_df['LOC_Y'], errors='coerce').fillna(0).to_numpy(dtype=float)
+    made = (pd.to_numeric(shot_df['SHOT_MADE_FLAG'], errors='coerce') == 1).to_numpy(dtype=float)
+
+    # a hex grid is two rectangular lattices offset by half a cell;
+    # each shot goes to the nearer of its two candidate centres
+    scale_x = bin_size
+    scale_y = bin_size * np.sqrt(3)
+    px, py = x / scale_x, y / scale_y
+    ix1, iy1 = np.round(px), np.round(py)
+    ix2, iy2 = np.floor(px), np.floor(py)
+    d1 = (px - ix1) ** 2 + 3 * (py - iy1) ** 2
+    d2 = (px - ix2 - 0.5) ** 2 + 3 * (py - iy2 - 0.5) ** 2
+    first = d1 <= d2
+    centre_x = np.where(first, ix1, ix2 + 0.5) * scale_x
+    centre_y = np.where(first, iy1, iy2 + 0.5) * scale_y
+
+    centres, group_ids = np.unique(np.column_stack([centre_x, centre_y]), axis=0, return_inverse=True)
+    bins = _aggregate(group_ids.ravel(), made, league_expectation(shot_df, league_avg_df))
+    bins.insert(0, 'x', np.round(centres[:, 0], 1))
+    bins.insert(1, 'y', np.round(centres[:, 1], 1))
+    return bins
+
+def zone_shots(shot_df: pd.DataFrame, league_avg_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Aggregate shots by court zone (SHOT_ZONE_BASIC / SHOT_ZONE_AREA)"""
+    zone = shot_df.get('SHOT_ZONE_BASIC', pd.Series('Unknown', index=shot_df.index)).fillna('Unknown').astype(str)
+    area = shot_df.get('SHOT_ZONE_AREA', pd.Series('Unknown', index=shot_df.index)).fillna('Unknown').astype(str)
+    made = (pd.to_numeric(shot_df['SHOT_MADE_FLAG'], errors='coerce') == 1).to_numpy(dtype=float)
+
+    group_ids, groups = pd.MultiIndex.from_arrays([zone, area]).factorize()
+    bins = _aggregate(group_ids, made, league_expectation(shot_df, league_avg_df))
+    bins.insert(0, 'zone', groups.get_level_values(0))
+    bins.insert(1, 'area', groups.get_level_values(1))
+    return bins.sort_values('attempts', ascending=False, kind='stable').reset_index(drop=True)
@@ -0,0 +1,233 @@
+import asyncio
+import contextvars
+import math
+import time
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from ..core.config import settings
+from ..core.exceptions import RateLimitExceededError
+from ..services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+# set in background tasks (cache warming) so their upstream calls yield to live traffic
+background_priority = contextvars.ContextVar("upstream_background_priority", default=False)
+
+class LoadPriority:
+    """
+    Priority of a load shared by several callers (see single_flight): it
+    starts as its creator's and becomes live as soon as a live caller joins,
+    so live requests never wait behind the background reserve.
+    """
+
+    def __init__(self, background: bool):
+        self.background = background
+        self.raised = asyncio.Event()
+
+    def raise_to_live(self):
+        """Wakes background waits on this load so they take a live token"""
+        self.background = False
+        self.raised.set()
+
+# set inside shared load tasks; takes precedence over background_priority
+load_priority: contextvars.ContextVar = contextvars.ContextVar("upstream_load_priority", default=None)
+
+def is_background() -> bool:
+    """Whether upstream calls made here should yield to live traffic"""
+    shared = load_priority.get()
+    return shared.background if shared is not None else background_priority.get()
+
+# Reserve a token and return how long the caller must wait for it. Tokens may
+# go negative: each waiter holds a reservation, so callers are served in
+# arrival order across every worker without polling. Uses the Redis clock so
+# all workers agree on time. Background callers pass a floor: they only take
+# a token if that leaves at least the floor free, and otherwise get '-2' plus
+# how long until the bucket refills past it.
+_RESERVE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local floor = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+if tokens - 1 < floor then
+    return {tostring(tokens), '-2', tostring((floor + 1 - tokens) / rate)}
+end
+local wait = math.max(0, (1 - tokens) / rate)
+if wait > max_wait then
+    return {tostring(tokens), '-1'}
+end
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+return {tostring(tokens), tostring(wait)}
+"""
+
+_PEEK_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+return tostring(math.min(capacity, tokens + math.max(0, now - ts) * rate))
+"""
+
+class TokenBucket:
+    """
+    Asyncio token bucket shared by all worker processes through Redis,
+    with an in-process bucket when Redis is disabled or unreachable.
+    Waiting is done with asyncio.sleep, so no executor thread is held.
+
+    Background callers never queue: they take a token only while at least
+    background_reserve of the capacity would stay free, so live requests
+    (which may reserve into negative tokens) always go first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        period_seconds: int,
+        max_wait_seconds: float,
+        background_reserve: float = 0.5
+    ):
+        self.key = f"token_bucket:{name}"
+        self.capacity = capacity
+        self.rate = capacity / period_seconds
+        self.max_wait_seconds = max_wait_seconds
+        self.background_floor = capacity * background_reserve
+        self.waiting = 0
+        self.background_waiting = 0
+
+        # local fallback state
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _reserve_local(self, floor: float) -> Tuple[float, float, float]:
+        """Reserve a token from the in-process bucket"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens - 1 < floor:
+            return self._tokens, -2.0, (floor + 1 - self._tokens) / self.rate
+
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if wait > self.max_wait_seconds:
+            return self._tokens, -1.0, 0.0
+
+        self._tokens -= 1
+        return self._tokens, wait, 0.0
+
+    async def _reserve(self, floor: float) -> Tuple[float, float, float]:
+        """Reserve a token, preferring the cluster-wide bucket"""
+        if cache_service.enabled:
+            try:
+                result = await cache_service.redis.eval(
+                    _RESERVE_SCRIPT, 1, self.key,
+                    self.capacity, self.rate, self.max_wait_seconds, floor
+                )
+                retry_after = float(result[2]) if len(result) > 2 else 0.0
+                return float(result[0]), float(result[1]), retry_after
+            except Exception as e:
+                logger.warning(f"Shared token bucket unavailable, using local bucket: {e}")
+        return self._reserve_local(floor)
+
+    async def _acquire_background(self) -> Optional[float]:
+        """
+        Poll for a token that leaves the reserve free; gives up after
+        max_wait_seconds. Returns None if a live caller joined the load
+        meanwhile, so the token should be taken at live priority instead.
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        self.background_waiting += 1
+        try:
+            while True:
+                if not is_background():
+                    return None
+                _, wait, retry_after = await self._reserve(self.background_floor)
+                if wait >= 0:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RateLimitExceededError("Upstream quota busy with live traffic")
+                await self._pause(min(max(retry_after, 0.05), remaining))
+        finally:
+            self.background_waiting -= 1
+        return self.max_wait_seconds - (deadline - time.monotonic())
+
+    async def _pause(self, seconds: float):
+        """Sleep between background polls, cut short if a live caller joins the load"""
+        shared = load_priority.get()
+        if shared is None:
+            await asyncio.sleep(seconds)
+            return
+        try:
+            await asyncio.wait_for(shared.raised.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time waited in seconds"""
+        waited = 0.0
+        if is_background():
+            start = time.monotonic()
+            background_wait = await self._acquire_background()
+            if background_wait is not None:
+                return background_wait
+            waited = time.monotonic() - start
+
+        # live traffic has no floor
+        _, wait, _ = await self._reserve(-self.capacity * 1e6)
+        if wait < 0:
+            raise RateLimitExceededError(
+                f"Upstream quota exhausted for more than {self.max_wait_seconds}s"
+            )
+
+        if wait > 0:
+            self.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self.waiting -= 1
+        return waited + wait
+
+    async def status(self) -> Dict[str, Any]:
+        """Current tokens (negative means reserved by queued callers) and local queue depth"""
+        tokens = None
+        shared = False
+        if cache_service.enabled:
+            try:
+                tokens = float(await cache_service.redis.eval(_PEEK_SCRIPT, 1, self.key, self.capacity, self.rate))
+                shared = True
+            except Exception as e:
+                logger.warning(f"Shared token bucket status unavailable: {e}")
+        if tokens is None:
+            elapsed = time.monotonic() - self._updated
+            tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+        return {
+            "shared": shared,
+            "capacity": self.capacity,
+            "refill_per_second": round(self.rate, 3),
+            "tokens": round(tokens, 2),
+            "reserved": max(0, math.ceil(-tokens)),
+            "queue_depth": self.waiting,
+            "background_waiting": self.background_waiting
+        }
+
+# upstream nba_api quota shared by every worker
+upstream_limiter = TokenBucket(
+    "nba_api",
+    settings.rate_limit_calls,
+    settings.rate_limit_period,
+    settings.upstream_max_wait_seconds,
+    settings.warmer_quota_reserve
+)
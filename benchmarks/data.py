@@ -0,0 +1,153 @@
+"""Synthetic nba_api-shaped frames at realistic sizes, seeded so every run sees the same data"""
+import numpy as np
+import pandas as pd
+
+CAREER_SEASONS = 20
+SHOT_CHART_SHOTS = 2000
+LEAGUE_PLAYERS = 540
+LEAGUE_TEAMS = 30
+
+SHOT_ZONES = ["Restricted Area", "In The Paint (Non-RA)", "Mid-Range", "Left Corner 3", "Right Corner 3", "Above the Break 3"]
+SHOT_AREAS = ["Center(C)", "Left Side(L)", "Right Side(R)", "Left Side Center(LC)", "Right Side Center(RC)"]
+ACTION_TYPES = ["Jump Shot", "Layup Shot", "Driving Layup Shot", "Pullup Jump shot", "Dunk Shot", "Step Back Jump shot"]
+TEAM_ABBREVIATIONS = [
+    "ATL", "BOS", "BKN", "CHA", "CHI", "CLE", "DAL", "DEN", "DET", "GSW",
+    "HOU", "IND", "LAC", "LAL", "MEM", "MIA", "MIL", "MIN", "NOP", "NYK",
+    "OKC", "ORL", "PHI", "PHX", "POR", "SAC", "SAS", "TOR", "UTA", "WAS"
+]
+
+def _season_ids(first_year: int, count: int):
+    return [f"{year}-{str(year + 1)[-2:]}" for year in range(first_year, first_year + count)]
+
+def _box_score(rng: np.random.Generator, n: int) -> dict:
+    """Per-game box score columns for a rotation player, internally consistent"""
+    minutes = rng.uniform(30, 36, n)
+    fga = rng.uniform(8, 11, n)
+    fgm = fga * rng.uniform(0.44, 0.52, n)
+    fg3a = rng.uniform(2, 5, n)
+    fg3m = fg3a * rng.uniform(0.32, 0.40, n)
+    fta = rng.uniform(1.5, 3, n)
+    ftm = fta * rng.uniform(0.70, 0.85, n)
+    oreb = rng.uniform(0.5, 2, n)
+    dreb = rng.uniform(3, 6, n)
+    return {
+        "MIN": minutes,
+        "FGM": fgm, "FGA": fga, "FG_PCT": fgm / fga,
+        "FG3M": fg3m, "FG3A": fg3a, "FG3_PCT": fg3m / fg3a,
+        "FTM": ftm, "FTA": fta, "FT_PCT": ftm / fta,
+        "OREB": oreb, "DREB": dreb, "REB": oreb + dreb,
+        "AST": rng.uniform(2, 6, n),
+        "STL": rng.uniform(0.5, 1.8, n),
+        "BLK": rng.uniform(0.2, 1.2, n),
+        "TOV": rng.uniform(1, 1.8, n),
+        "PF": rng.uniform(1.5, 3, n),
+        "PTS": 2 * fgm + fg3m + ftm
+    }
+
+def career_frame(seasons: int = CAREER_SEASONS, seed: int = 1) -> pd.DataFrame:
+    """PlayerCareerStats season totals for one long career"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "PLAYER_ID": 2544,
+        "SEASON_ID": _season_ids(2004, seasons),
+        "LEAGUE_ID": "00",
+        "TEAM_ID": 1610612747,
+        "TEAM_ABBREVIATION": rng.choice(TEAM_ABBREVIATIONS, seasons),
+        "PLAYER_AGE": np.arange(19, 19 + seasons, dtype=float),
+        "GP": rng.integers(55, 83, seasons),
+        "GS": rng.integers(40, 83, seasons),
+        **_box_score(rng, seasons)
+    })
+    df["SEASON_TYPE"] = "Regular Season"
+    return df
+
+def shot_frame(shots: int = SHOT_CHART_SHOTS, seed: int = 2) -> pd.DataFrame:
+    """ShotChartDetail shot rows for one player season"""
+    rng = np.random.default_rng(seed)
+    distance = rng.gamma(2.0, 6.0, shots).clip(0, 40).astype(int)
+    angle = rng.uniform(0, np.pi, shots)
+    return pd.DataFrame({
+        "GRID_TYPE": "Shot Chart Detail",
+        "GAME_ID": [f"00223{game:05d}" for game in rng.integers(1, 1231, shots)],
+        "GAME_EVENT_ID": np.arange(shots),
+        "PLAYER_ID": 2544,
+        "PLAYER_NAME": "LeBron James",
+        "TEAM_ID": 1610612747,
+        "TEAM_NAME": "Los Angeles Lakers",
+        "PERIOD": rng.integers(1, 5, shots),
+        "MINUTES_REMAINING": rng.integers(0, 12, shots),
+        "SECONDS_REMAINING": rng.integers(0, 60, shots),
+        "EVENT_TYPE": "Made Shot",
+        "ACTION_TYPE": rng.choice(ACTION_TYPES, shots),
+        "SHOT_TYPE": np.where(distance >= 23, "3PT Field Goal", "2PT Field Goal"),
+        "SHOT_ZONE_BASIC": rng.choice(SHOT_ZONES, shots),
+        "SHOT_ZONE_AREA": rng.choice(SHOT_AREAS, shots),
+        "SHOT_ZONE_RANGE": "8-16 ft.",
+        "SHOT_DISTANCE": distance,
+        "LOC_X": (np.cos(angle) * distance * 10).astype(int),
+        "LOC_Y": (np.sin(angle) * distance * 10).astype(int),
+        "SHOT_ATTEMPTED_FLAG": 1,
+        "SHOT_MADE_FLAG": (rng.random(shots) < 0.48).astype(int),
+        "GAME_DATE": "20231024",
+        "HTM": "LAL",
+        "VTM": "DEN"
+    })
+
+def league_average_frame() -> pd.DataFrame:
+    """ShotChartDetail LeagueAverages rows (second frame of the endpoint)"""
+    rows = []
+    for zone_index, zone in enumerate(SHOT_ZONES):
+        for area_index, area in enumerate(SHOT_AREAS):
+            fga = 2000 + 150 * area_index
+            fg_pct = 0.62 - 0.05 * zone_index + 0.01 * area_index
+            rows.append({
+                "GRID_TYPE": "League Averages",
+                "SHOT_ZONE_BASIC": zone,
+                "SHOT_ZONE_AREA": area,
+                "SHOT_ZONE_RANGE": "8-16 ft.",
+                "FGA": fga,
+                "FGM": int(fga * fg_pct),
+                "FG_PCT": fg_pct
+            })
+    return pd.DataFrame(rows)
+
+def league_player_frame(players: int = LEAGUE_PLAYERS, seed: int = 3) -> pd.DataFrame:
+    """LeagueDashPlayerStats per-game rows for a full league season"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "PLAYER_ID": np.arange(1_600_000, 1_600_000 + players),
+        "PLAYER_NAME": [f"Player {i}" for i in range(players)],
+        "TEAM_ID": 1610612737 + rng.integers(0, LEAGUE_TEAMS, players),
+        "TEAM_ABBREVIATION": rng.choice(TEAM_ABBREVIATIONS, players),
+        "AGE": rng.integers(19, 40, players).astype(float),
+        "GP": rng.integers(1, 83, players),
+        "W": rng.integers(0, 60, players),
+        "L": rng.integers(0, 60, players),
+        **_box_score(rng, players)
+    })
+    df["SEASON_ID"] = "2023-24"
+    df["PLUS_MINUS"] = rng.normal(0, 3, players)
+    return df
+
+def team_frame(teams: int = LEAGUE_TEAMS, seed: int = 4) -> pd.DataFrame:
+    """LeagueDashTeamStats rows (base plus advanced columns) for every team"""
+    rng = np.random.default_rng(seed)
+    wins = rng.integers(15, 65, teams)
+    off_rating = rng.uniform(108, 122, teams)
+    def_rating = rng.uniform(108, 122, teams)
+    pace = rng.uniform(96, 104, teams)
+    return pd.DataFrame({
+        "TEAM_ID": 1610612737 + np.arange(teams),
+        "TEAM_NAME": [f"Team {abbreviation}" for abbreviation in TEAM_ABBREVIATIONS[:teams]],
+        "GP": 82,
+        "W": wins,
+        "L": 82 - wins,
+        "W_PCT": wins / 82,
+        "MIN": 48.0,
+        "PTS": off_rating * pace / 100,
+        "OPP_PTS": def_rating * pace / 100,
+        "PACE": pace,
+        "OFF_RATING": off_rating,
+        "DEF_RATING": def_rating,
+        "NET_RATING": off_rating - def_rating
+    })
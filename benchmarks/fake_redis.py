@@ -0,0 +1,68 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+class FakePipeline:
+    """Queues the pipelined reads CacheService.get issues and runs them on execute"""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self._calls: List[Tuple[str, str]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._calls = []
+
+    def get(self, key: str):
+        self._calls.append(("get", key))
+        return self
+
+    def pttl(self, key: str):
+        self._calls.append(("pttl", key))
+        return self
+
+    async def execute(self) -> List[Any]:
+        return [await getattr(self.redis, name)(key) for name, key in self._calls]
+
+class FakeRedis:
+    """
+    In-process stand-in for the redis.asyncio commands CacheService uses.
+    Values are stored as the encoded bytes, so codec cost is measured but
+    network round-trips are not.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    async def setex(self, key: str, seconds: int, value: bytes) -> bool:
+        self._data[key] = (bytes(value), time.monotonic() + seconds)
+        return True
+
+    async def pttl(self, key: str) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - time.monotonic()) * 1000)
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def publish(self, channel: str, message: str) -> int:
+        return 0
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
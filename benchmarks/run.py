@@ -0,0 +1,305 @@
+"""
+Micro-benchmarks for the hot paths behind the heaviest endpoints.
+
+    python -m benchmarks.run                       # print results
+    python -m benchmarks.run --save                # rewrite benchmarks/baseline.json
+    python -m benchmarks.run --compare             # diff against the baseline, exit 1 on regressions
+    python -m benchmarks.run --filter codecs       # only cases whose name contains "codecs"
+    python -m benchmarks.run --redis-url redis://localhost:6379/15
+
+Cache cases use FakeRedis (an in-process stand-in) unless --redis-url is
+given. Timings are per call in microseconds; compare baselines recorded on
+the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.compression import CompressionMiddleware, available_encoders
+from app.core.responses import FastJSONResponse, trusted_response
+from app.models.schemas import SeasonStats, ShotChartResponse, ShotData, TeamStats, TeamStatsResponse
+from app.routers.players import SEASON_STATS_COLUMNS, SHOT_COLUMNS
+from app.routers.teams import TEAM_STATS_COLUMNS
+from app.services.cache_service import CacheService
+from app.utils.codecs import decode_value, encode_value
+from app.utils.helpers import calculate_advanced_stats, detect_career_milestones
+from app.utils.response_builder import build_records
+from app.utils.shot_bins import hexbin_shots, zone_shots
+
+from . import data
+from .fake_redis import FakeRedis
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], Union[None, Awaitable[None]]]
+    is_async: bool = False
+
+def _frames() -> Dict[str, pd.DataFrame]:
+    career = data.career_frame()
+    return {
+        "career_20": career,
+        "career_20_advanced": calculate_advanced_stats(career),
+        "shots_2000": data.shot_frame(),
+        "league_averages": data.league_average_frame(),
+        "league_540": data.league_player_frame(),
+        "teams_30": data.team_frame()
+    }
+
+def _response_field(model):
+    """The response field FastAPI builds for a route's response_model"""
+    from fastapi.utils import create_response_field
+    return create_response_field(name=f"Response_{model.__name__}", type_=model)
+
+def _render(model, response_class=None) -> Callable[[dict], Awaitable[bytes]]:
+    """Validate and serialize a route's return value the way FastAPI does"""
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    field = _response_field(model)
+    response_class = response_class or JSONResponse
+
+    async def render(payload: dict) -> bytes:
+        content = await serialize_response(field=field, response_content=payload)
+        return response_class(content).body
+
+    return render
+
+def _cache_backends(redis_url: str) -> Dict[str, CacheService]:
+    """A memory-only CacheService and one in front of a Redis(-compatible) server"""
+    memory = CacheService()
+
+    shared = CacheService()
+    if redis_url:
+        import redis.asyncio as aioredis
+        shared.redis = aioredis.from_url(redis_url)
+    else:
+        shared.redis = FakeRedis()
+    shared.enabled = True
+    # mirror CacheService.connect: the local tier becomes L1
+    from app.core.config import settings
+    shared.memory.max_bytes = settings.l1_cache_max_bytes
+    shared.memory.max_entries = settings.l1_cache_max_entries
+    shared.memory.namespace_limits = {}
+
+    return {"memory": memory, "redis": shared}
+
+def build_cases(redis_url: str = None) -> List[Case]:
+    frames = _frames()
+    career = frames["career_20"]
+    career_advanced = frames["career_20_advanced"]
+    shots = frames["shots_2000"]
+    league_averages = frames["league_averages"]
+    league = frames["league_540"]
+    teams = frames["teams_30"]
+
+    cases = [
+        Case("helpers.calculate_advanced_stats[career_20]", lambda: calculate_advanced_stats(career)),
+        Case("helpers.calculate_advanced_stats[league_540]", lambda: calculate_advanced_stats(league)),
+        Case("helpers.detect_career_milestones[career_20]", lambda: detect_career_milestones(career_advanced, "Benchmark Player")),
+        Case("response_builder.build_records[season_stats_20]", lambda: build_records(career_advanced, SEASON_STATS_COLUMNS, SeasonStats)),
+        Case("response_builder.build_records[shots_2000]", lambda: build_records(shots, SHOT_COLUMNS, ShotData)),
+        Case("response_builder.build_records[teams_30]", lambda: build_records(teams, TEAM_STATS_COLUMNS, TeamStats)),
+        Case("shot_bins.hexbin_shots[shots_2000]", lambda: hexbin_shots(shots, 15.0, league_averages)),
+        Case("shot_bins.zone_shots[shots_2000]", lambda: zone_shots(shots, league_averages))
+    ]
+
+    # serialization of complete responses through FastAPI's response_model path
+    shot_payload = {
+        "player_name": "Benchmark Player",
+        "season": "2023-24",
+        "shots": build_records(shots, SHOT_COLUMNS, ShotData),
+        "summary": {"total_shots": len(shots), "makes": int(shots["SHOT_MADE_FLAG"].sum()), "fg_pct": 0.48}
+    }
+    team_payload = {"season": "2023-24", "teams": build_records(teams, TEAM_STATS_COLUMNS, TeamStats)}
+    render_shots = _render(ShotChartResponse)
+    render_teams = _render(TeamStatsResponse)
+    render_shots_fast = _render(ShotChartResponse, FastJSONResponse)
+    render_teams_fast = _render(TeamStatsResponse, FastJSONResponse)
+    cases += [
+        # stock JSONResponse (before), the app's orjson class, and the trusted path without the model pass
+        Case("response.render[shot_chart_2000]", lambda: render_shots(shot_payload), True),
+        Case("response.render[team_stats_30]", lambda: render_teams(team_payload), True),
+        Case("response.render_fast[shot_chart_2000]", lambda: render_shots_fast(shot_payload), True),
+        Case("response.render_fast[team_stats_30]", lambda: render_teams_fast(team_payload), True),
+        Case("response.trusted[shot_chart_2000]", lambda: trusted_response(shot_payload).body),
+        Case("response.trusted[team_stats_30]", lambda: trusted_response(team_payload).body)
+    ]
+
+    # response compression: a cold compress vs. the middleware's cache of compressed bodies
+    shot_body = trusted_response(shot_payload).body
+    compression = CompressionMiddleware(None)
+    for encoding, encoder in available_encoders().items():
+        cases += [
+            Case(f"compression.{encoding}[shot_chart_2000]", lambda encoder=encoder: encoder.compress(shot_body)),
+            Case(f"compression.cached_{encoding}[shot_chart_2000]", lambda encoding=encoding: compression.compressed(encoding, shot_body))
+        ]
+
+    # cache codecs
+    codec_values = {
+        "career_20": career,
+        "shots_2000": shots,
+        "league_540": league,
+        "json_shot_records": shot_payload["shots"]
+    }
+    for label, value in codec_values.items():
+        encoded = encode_value(value)
+        cases += [
+            Case(f"codecs.encode[{label}]", lambda value=value: encode_value(value)),
+            Case(f"codecs.decode[{label}]", lambda encoded=encoded: decode_value(encoded))
+        ]
+
+    # cache round-trips: memory-only, L1 hits, and L2 reads that decode from Redis
+    for backend, cache in _cache_backends(redis_url).items():
+        for label in ("career_20", "shots_2000"):
+            key = f"bench_{label}:{backend}"
+            value = frames[label]
+
+            async def round_trip(cache=cache, key=key, value=value):
+                await cache.set(key, value, 5)
+                await cache.get(key)
+
+            cases.append(Case(f"cache.set_get[{backend}:{label}]", round_trip, True))
+
+            if backend == "redis":
+                async def l2_get(cache=cache, key=key):
+                    cache.memory.delete(key)
+                    await cache.get(key)
+
+                async def l1_get(cache=cache, key=key):
+                    await cache.get(key)
+
+                cases += [
+                    Case(f"cache.get_l1[{backend}:{label}]", l1_get, True),
+                    Case(f"cache.get_l2[{backend}:{label}]", l2_get, True)
+                ]
+
+    return cases
+
+def _run_batch(case: Case, loops: int, loop: asyncio.AbstractEventLoop) -> float:
+    """Seconds taken by `loops` calls of a case"""
+    if not case.is_async:
+        func = case.func
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+
+    async def batch():
+        func = case.func
+        start = time.perf_counter()
+        for _ in range(loops):
+            await func()
+        return time.perf_counter() - start
+
+    return loop.run_until_complete(batch())
+
+def measure(case: Case, loop: asyncio.AbstractEventLoop, rounds: int, min_time: float) -> dict:
+    """Calibrate loops so a round takes at least min_time, then time `rounds` rounds"""
+    # warm caches, lazy imports and the first L1 fill
+    _run_batch(case, 1, loop)
+
+    loops = 1
+    while True:
+        elapsed = _run_batch(case, loops, loop)
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    per_call = [_run_batch(case, loops, loop) / loops * 1e6 for _ in range(rounds)]
+    return {
+        "median_us": round(statistics.median(per_call), 2),
+        "min_us": round(min(per_call), 2),
+        "stdev_us": round(statistics.stdev(per_call), 2) if rounds > 1 else 0.0,
+        "loops": loops,
+        "rounds": rounds
+    }
+
+def environment(redis_url: str = None) -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "redis_backend": "redis" if redis_url else "fake",
+        "recorded_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    }
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print median changes against a baseline; returns the names of regressed cases"""
+    regressions = []
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<{width}}  {result['median_us']:>12.2f} us  (new)")
+            continue
+        ratio = result["median_us"] / before["median_us"] if before["median_us"] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  improved"
+        print(f"{name:<{width}}  {before['median_us']:>12.2f} -> {result['median_us']:>12.2f} us  ({ratio - 1:+.1%}){flag}")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark data-processing and cache hot paths")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=7, help="timed rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per round")
+    parser.add_argument("--redis-url", default=None, help="time cache cases against a real Redis instead of FakeRedis")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="compare with the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for case in build_cases(args.redis_url):
+            if args.filter not in case.name:
+                continue
+            results[case.name] = measure(case, loop, args.rounds, args.min_time)
+            if not args.compare:
+                result = results[case.name]
+                print(f"{case.name:<55} {result['median_us']:>12.2f} us  (min {result['min_us']:.2f}, {result['loops']} loops)")
+    finally:
+        loop.close()
+
+    regressions = []
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold)
+
+    if args.save:
+        if args.filter and os.path.exists(args.baseline):
+            # a filtered run only replaces the cases it measured
+            with open(args.baseline) as f:
+                results = {**json.load(f)["results"], **results}
+        report = {"environment": environment(args.redis_url), "results": dict(sorted(results.items()))}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Saved {len(results)} results to {args.baseline}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())